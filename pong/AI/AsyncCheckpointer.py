@@ -0,0 +1,156 @@
+# package pong.AI
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+import gzip
+import io
+import os
+import pickle
+import random
+import neat
+from pong.AI.PicklableReporter import PicklableReporter
+
+class AsyncCheckpointer(PicklableReporter):
+    """
+    Checkpointer writing compressed snapshots in a background thread.
+
+    The state is pickled on the training thread at the end of a generation, so the
+    snapshot is consistent, then compressed and written in the background while the
+    next generation is evaluated. Files are written to a temporary name and renamed,
+    so a crash never leaves a half-written checkpoint.
+
+    Full checkpoints have the format of neat.Checkpointer. With full_every set, only every
+    full_every-th checkpoint is full, the ones in between are deltas: the genomes that are
+    not in the previous full checkpoint, while species refer to the others by key.
+    Retention keeps the last keep_last checkpoints, the first one after every keep_every
+    generations (24, 49, ... with keep_every 25 and checkpoints every 5 generations from 0)
+    and the full checkpoints these depend on. Older checkpoints of this run are deleted.
+    """
+    DELTA = "delta"
+    UNPICKLED = dict(executor=None, pending=[])
+
+    def __init__(self, directory: str, interval: int = 5, prefix: str = "neat-checkpoint-",
+                 full_every: int = None, keep_last: int = 3, keep_every: int = 25, compresslevel: int = 5):
+        self.directory = directory
+        self.interval = interval
+        self.prefix = prefix
+        self.full_every = full_every
+        self.keep_last = keep_last
+        self.keep_every = keep_every
+        self.compresslevel = compresslevel
+        self.current_generation = None
+        self.last_checkpoint = -1
+        self.saved = 0
+        self.last_saved = -1   # Generation of the last checkpoint saved
+        # (generation, file name, file name of the base or None, kept for keep_every) retained, in order
+        self.checkpoints = []
+        self.base = None       # (file name, genome keys) of the last full checkpoint
+        self.executor = None
+        self.pending = []
+
+    def start_generation(self, generation):
+        self.current_generation = generation
+
+    def end_generation(self, config, population, species_set):
+        if self.current_generation - self.last_checkpoint >= self.interval:
+            self.save_checkpoint(config, population, species_set, self.current_generation)
+            self.last_checkpoint = self.current_generation
+
+    def save_checkpoint(self, config, population, species_set, generation):
+        """Pickles the state now, compresses and writes it in the background."""
+        name = self.prefix + str(generation)
+        full = self.full_every is None or self.base is None or self.saved % self.full_every == 0
+        self.saved += 1
+        if full:
+            data = pickle.dumps((generation, config, population, species_set, random.getstate()),
+                                protocol=pickle.HIGHEST_PROTOCOL)
+            self.base = (name, set(population))
+            base = None
+        else:
+            base = self.base[0]
+            data = self.__pickle_delta(generation, base, self.base[1], population, species_set)
+        # Generation g is saved after g + 1 generations, so milestones are on completed generations
+        milestone = (bool(self.keep_every)
+                     and (generation + 1) // self.keep_every > (self.last_saved + 1) // self.keep_every)
+        self.last_saved = generation
+        self.checkpoints.append((generation, name, base, milestone))
+
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="checkpointer")
+        for future in self.pending:
+            if future.done():
+                future.result()  # Raises the error of a failed write
+        self.pending = [future for future in self.pending if not future.done()]
+        self.pending.append(self.executor.submit(self.__write, name, data, self.__expired()))
+
+    def close(self):
+        """Waits for the pending writes, raising their errors if any."""
+        for future in self.pending:
+            future.result()
+        self.pending = []
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    @classmethod
+    def restore_checkpoint(cls, filename: str) -> neat.Population:
+        """Resumes from a full or delta checkpoint (or one of neat.Checkpointer)."""
+        generation, config, population, species_set, rndstate = cls.load(filename)
+        random.setstate(rndstate)
+        return neat.Population(config, (population, species_set, generation))
+
+    @classmethod
+    def load(cls, filename: str) -> Tuple:
+        """Returns (generation, config, population, species_set, random state) of a checkpoint."""
+        with gzip.open(filename) as file:
+            header = pickle.load(file)
+            if header[0] != cls.DELTA:
+                return header
+            _, generation, base = header
+            _, config, base_population, _, _ = cls.load(os.path.join(os.path.dirname(filename), base))
+            unpickler = pickle.Unpickler(file)
+            unpickler.persistent_load = base_population.__getitem__
+            genomes, fitnesses, species_set, rndstate = unpickler.load()
+        for key, fitness in fitnesses.items():
+            base_population[key].fitness = fitness
+        population = {key: base_population[key] for key in fitnesses}
+        population.update(genomes)
+        return generation, config, population, species_set, rndstate
+
+    # ---------- Helpers ------------------------
+
+    def __pickle_delta(self, generation: int, base: str, base_keys: set, population: Dict, species_set) -> bytes:
+        """Pickles the genomes not in the base checkpoint, the others (also in species) as keys."""
+        known = {id(genome): key for key, genome in population.items() if key in base_keys}
+        output = io.BytesIO()
+        pickle.dump((self.DELTA, generation, base), output, protocol=pickle.HIGHEST_PROTOCOL)
+        pickler = pickle.Pickler(output, protocol=pickle.HIGHEST_PROTOCOL)
+        pickler.persistent_id = lambda obj: known.get(id(obj))
+        genomes = {key: genome for key, genome in population.items() if key not in base_keys}
+        fitnesses = {key: population[key].fitness for key in population if key in base_keys}
+        pickler.dump((genomes, fitnesses, species_set, random.getstate()))
+        return output.getvalue()
+
+    def __expired(self) -> List[str]:
+        """Returns the file names of checkpoints the retention policy drops, forgetting them."""
+        keep = {name for _, name, _, _ in self.checkpoints[-self.keep_last:]} if self.keep_last > 0 else set()
+        keep.update(name for _, name, _, milestone in self.checkpoints if milestone)
+        keep.update(base for _, name, base, _ in self.checkpoints if name in keep and base is not None)
+        if self.base is not None:
+            keep.add(self.base[0])  # Future deltas depend on it
+        expired = [name for _, name, _, _ in self.checkpoints if name not in keep]
+        self.checkpoints = [checkpoint for checkpoint in self.checkpoints if checkpoint[1] in keep]
+        return expired
+
+    def __write(self, name: str, data: bytes, expired: List[str]):
+        path = os.path.join(self.directory, name)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as output:
+            with gzip.GzipFile(name, "wb", self.compresslevel, output) as file:
+                file.write(data)
+            output.flush()
+            os.fsync(output.fileno())
+        os.replace(tmp_path, path)
+        for old in expired:
+            old_path = os.path.join(self.directory, old)
+            if os.path.exists(old_path):
+                os.remove(old_path)
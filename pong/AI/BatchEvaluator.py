@@ -0,0 +1,69 @@
+# package pong.AI
+from typing import List, Tuple
+import numpy as np
+from pong.AI.BatchNetwork import BatchNetwork
+from pong.AI.MatchEvaluator import MatchEvaluator
+from pong.AI.Scheduler import Scheduler
+from pong.model.PongBatch import PongBatch
+
+class BatchEvaluator(MatchEvaluator):
+    """
+    Plays all matches of a generation at once, in one process.
+
+    The genomes are compiled into a BatchNetwork and the matches run side by side
+    on a PongBatch, so every frame costs one batched network call per paddle side
+    and one PongBatch.step, whatever the number of matches.
+    With a decision_interval above 1 a match only takes the decisions of its networks
+    every that many frames (and after every hit), keeping the paddle speeds in between.
+    """
+    MAX_HITS = 50
+
+    def __init__(self, seed: int = 0, scheduler: Scheduler = None, decision_interval: int = 1):
+        super().__init__(workers=1, seed=seed, scheduler=scheduler, decision_interval=decision_interval)
+
+    def play(self, config, pairs) -> List[Tuple[int, int]]:
+        """Plays the (left genome, right genome) pairs, returns the fitness contributions per pair."""
+        if not pairs:
+            return []
+        # Compile every genome once, even if it plays several matches
+        rows = {}
+        for genome in (genome for pair in pairs for genome in pair):
+            rows.setdefault(id(genome), (len(rows), genome))
+        networks = BatchNetwork.create([genome for _, genome in rows.values()], config)
+        left = networks.take([rows[id(genome1)][0] for genome1, _ in pairs])
+        right = networks.take([rows[id(genome2)][0] for _, genome2 in pairs])
+        batch = PongBatch(len(pairs), seed=self.match_seed(self.match_index))
+        self.match_index += len(pairs)
+        self.matches += len(pairs)
+
+        inputs = np.empty((len(pairs), 3))
+        actions = np.empty((len(pairs), 2), dtype=np.int64)
+        active = np.ones(len(pairs), dtype=bool)
+        results = np.zeros((len(pairs), 2), dtype=np.int64)
+        decide_in = np.zeros(len(pairs), dtype=np.int64)  # Frames until the next decision per match
+        hits = np.zeros(len(pairs), dtype=np.int64)
+        while active.any():
+            due = active & (decide_in <= 0)
+            if due.any():
+                for side, network in ((0, left), (1, right)):
+                    inputs[:, 0] = batch.paddle_y[:, side]
+                    inputs[:, 1] = batch.ball_y
+                    inputs[:, 2] = np.abs(batch.ball_x - PongBatch.PADDLE_X[side])
+                    actions[:, side] = network.decide(inputs)
+                actions[~due] = PongBatch.KEEP
+                decide_in[due] = self.decision_interval
+            else:
+                actions.fill(PongBatch.KEEP)
+
+            np.sum(batch.hits, axis=1, out=hits)
+            scored = batch.step(actions, active)
+            decide_in -= 1
+            # Decide again right after a hit or point
+            decide_in[(scored != 0) | (batch.hits.sum(axis=1) != hits)] = 0
+            self.frames += int(np.count_nonzero(active))
+            done = active & ((scored != 0) | (batch.hits > self.MAX_HITS).any(axis=1))
+            # Touchdown resets the hits, so right hits only count for rallies ending on hits
+            results[done, 0] = batch.points[done, 0]
+            results[done, 1] = batch.hits[done, 1]
+            active &= ~done
+        return [tuple(row) for row in results.tolist()]
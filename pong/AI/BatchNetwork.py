@@ -0,0 +1,89 @@
+# package pong.AI
+from neat.graphs import feed_forward_layers
+import numpy as np
+
+class BatchNetwork:
+    """
+    A set of NEAT feed-forward networks compiled into padded NumPy tensors.
+
+    Every network gets the same node slots: inputs first, then outputs, then hidden nodes.
+    Layer l of network g is a dense (slots x slots) weight matrix, plus a mask telling
+    which slots that layer computes, so all networks are evaluated layer by layer
+    in one batched matrix product. Gives the same outputs as neat.nn.FeedForwardNetwork
+    for the relu/sum node settings in config.ini, and raises ValueError for any other.
+    """
+    SUPPORTED_ACTIVATIONS = ("relu",)
+    SUPPORTED_AGGREGATIONS = ("sum",)
+
+    def __init__(self, weights: np.ndarray, bias: np.ndarray, response: np.ndarray,
+                 layers: np.ndarray, num_inputs: int, num_outputs: int):
+        self.weights = weights      # (networks, layers, slots, slots), [source, target]
+        self.bias = bias            # (networks, slots)
+        self.response = response    # (networks, slots)
+        self.layers = layers        # (networks, layers, slots), slots computed per layer
+        self.num_inputs = num_inputs
+        self.num_outputs = num_outputs
+
+    @classmethod
+    def create(cls, genomes, config) -> "BatchNetwork":
+        """Compiles given genomes (in order) into one BatchNetwork."""
+        genome_config = config.genome_config
+        input_keys = genome_config.input_keys
+        output_keys = genome_config.output_keys
+        fixed_slots = len(input_keys) + len(output_keys)
+
+        compiled = []
+        for genome in genomes:
+            for node, ng in genome.nodes.items():
+                if ng.activation not in cls.SUPPORTED_ACTIVATIONS or ng.aggregation not in cls.SUPPORTED_AGGREGATIONS:
+                    raise ValueError(f"Unsupported node {node}: {ng.activation}/{ng.aggregation}")
+            connections = [cg.key for cg in genome.connections.values() if cg.enabled]
+            node_layers = feed_forward_layers(input_keys, output_keys, connections)
+            slot = {key: i for i, key in enumerate(input_keys + output_keys)}
+            for layer in node_layers:
+                for node in sorted(layer):
+                    slot.setdefault(node, len(slot))
+            compiled.append((genome, connections, node_layers, slot))
+
+        num_slots = max([fixed_slots] + [len(slot) for _, _, _, slot in compiled])
+        num_layers = max([1] + [len(node_layers) for _, _, node_layers, _ in compiled])
+        weights = np.zeros((len(compiled), num_layers, num_slots, num_slots))
+        bias = np.zeros((len(compiled), num_slots))
+        response = np.ones((len(compiled), num_slots))
+        layers = np.zeros((len(compiled), num_layers, num_slots), dtype=bool)
+
+        for g, (genome, connections, node_layers, slot) in enumerate(compiled):
+            for l, layer in enumerate(node_layers):
+                for node in layer:
+                    ng = genome.nodes[node]
+                    target = slot[node]
+                    layers[g, l, target] = True
+                    bias[g, target] = ng.bias
+                    response[g, target] = ng.response
+            layer_of = {node: l for l, layer in enumerate(node_layers) for node in layer}
+            for inode, onode in connections:
+                if onode in layer_of:
+                    weights[g, layer_of[onode], slot[inode], slot[onode]] = genome.connections[(inode, onode)].weight
+
+        return cls(weights, bias, response, layers, len(input_keys), len(output_keys))
+
+    def take(self, rows) -> "BatchNetwork":
+        """Returns a BatchNetwork with the networks at given rows, e.g. one row per match."""
+        return BatchNetwork(
+            self.weights[rows], self.bias[rows], self.response[rows],
+            self.layers[rows], self.num_inputs, self.num_outputs
+        )
+
+    def activate(self, inputs: np.ndarray) -> np.ndarray:
+        """Evaluates network i on inputs[i], returns the outputs as a (networks, outputs) array."""
+        values = np.zeros(self.bias.shape)
+        values[:, :self.num_inputs] = inputs
+        for l in range(self.weights.shape[1]):
+            s = np.matmul(values[:, None, :], self.weights[:, l])[:, 0, :]
+            z = self.bias + self.response * s
+            values = np.where(self.layers[:, l], np.maximum(z, 0.0), values)
+        return values[:, self.num_inputs:self.num_inputs + self.num_outputs]
+
+    def decide(self, inputs: np.ndarray) -> np.ndarray:
+        """Returns the decision (index of the largest output) of every network."""
+        return np.argmax(self.activate(inputs), axis=1)
@@ -0,0 +1,156 @@
+# package pong.AI
+from math import ceil
+from multiprocessing import Pool, parent_process, util
+from typing import Dict, List, Tuple
+import os
+import random
+import neat
+from pong.model.Config import *
+from pong.model.PongMatch import PongMatch
+from pong.AI.Scheduler import RoundRobinScheduler, Scheduler
+
+class MatchEvaluator:
+    """
+    Plays the genome-pair matches of a generation in parallel.
+
+    Which genomes meet is decided by a Scheduler (round robin by default).
+    Matches run headless on their own PongMatch, in a multiprocessing pool,
+    so workers only receive the genomes and config (no pygame state).
+    Every match is seeded from its position in the generation, which makes
+    the resulting fitness independent of the number of workers.
+    With workers <= 1 the matches are played in-process, handy for debugging.
+    With a decision_interval above 1 the networks decide every that many frames
+    (and after every hit), and PongMatch.advance skips the frames in between.
+    A timestep above 1 simulates that many frames per update, with swept collisions.
+    With record set, every match is recorded to that file (see MatchRecorder), its id
+    being the match seed. Pool workers each record to their own file, named after their pid,
+    closed when the worker exits.
+    """
+    recorders: Dict[str, "MatchRecorder"] = {}  # Open recorders of this process, by path
+
+    def __init__(self, workers: int = None, seed: int = 0, scheduler: Scheduler = None,
+                 decision_interval: int = 1, timestep: float = 1, record: str = None):
+        self.workers = os.cpu_count() if workers is None else workers
+        self.seed = seed
+        self.decision_interval = decision_interval
+        self.timestep = timestep
+        self.record = record
+        self.scheduler = RoundRobinScheduler() if scheduler is None else scheduler
+        self.generation = 0
+        self.match_index = 0
+        # Totals over the run, see TimingReporter
+        self.matches = 0
+        self.frames = 0
+        self.pool = None
+
+    def __call__(self, genomes, config):
+        """Evaluates the genomes, usable as fitness function for neat.Population.run."""
+        self.match_index = 0
+        rng = random.Random(self.match_seed(-1))
+        self.scheduler.evaluate(genomes, lambda pairs: self.play(config, pairs), rng)
+        self.generation += 1
+
+    def play(self, config, pairs) -> List[Tuple[int, int]]:
+        """Plays the (left genome, right genome) pairs, returns the fitness contributions per pair."""
+        jobs = [
+            (genome1, genome2, config, self.match_seed(self.match_index + k),
+             self.decision_interval, self.timestep, self.record)
+            for k, (genome1, genome2) in enumerate(pairs)
+        ]
+        self.match_index += len(jobs)
+        results = self.__map(jobs)
+        self.matches += len(results)
+        self.frames += sum(frames for _, _, frames in results)
+        return [(fitness1, fitness2) for fitness1, fitness2, _ in results]
+
+    def counters(self) -> Tuple[int, int]:
+        """Returns the matches played and frames simulated so far."""
+        return self.matches, self.frames
+
+    def close(self):
+        """Shuts down the worker pool, if any, and closes the recording."""
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+        self.close_recorders()
+
+    @staticmethod
+    def play_match(genome1, genome2, config, seed: int, decision_interval: int = 1,
+                   timestep: float = 1) -> Tuple[int, int]:
+        """Plays one headless match, returns the fitness contributions of both genomes."""
+        return MatchEvaluator.play_counted(genome1, genome2, config, seed, decision_interval, timestep)[:2]
+
+    @staticmethod
+    def play_counted(genome1, genome2, config, seed: int, decision_interval: int = 1,
+                     timestep: float = 1, record: str = None) -> Tuple[int, int, int]:
+        """Like play_match, also returning the number of frames simulated."""
+        net1 = neat.nn.FeedForwardNetwork.create(genome1, config)
+        net2 = neat.nn.FeedForwardNetwork.create(genome2, config)
+        match = PongMatch(random.Random(seed), timestep=timestep)
+        match.load_entities()
+        frames = 0
+        recorder = None if record is None else MatchEvaluator.recorder(record)
+        if recorder is not None:
+            recorder.begin_match(match, seed)
+        decisions = [0, 0]
+
+        while True:
+            for side, net, paddle in ((0, net1, match.left_paddle), (1, net2, match.right_paddle)):
+                output = net.activate((paddle.y, match.ball.y, abs(match.ball.x - paddle.x)))
+                decision = decisions[side] = output.index(max(output))
+                if decision == 1:
+                    paddle.accelerate(0, -PADDLE_SPEED)
+                elif decision == 2:
+                    paddle.accelerate(0, PADDLE_SPEED)
+
+            if decision_interval == 1:
+                match.update()
+                advanced = 1
+            else:
+                advanced = match.advance(decision_interval)
+            frames += advanced * timestep
+            if recorder is not None:
+                # Frames simulated (rounded up), not updates, as the frame counter of the recording
+                recorder.record(match, decisions[0], decisions[1], ceil(round(frames, 6)) - recorder.frame)
+            if match.points_left >= 1 or match.points_right >= 1 or match.left_hits > 50 or match.right_hits > 50:
+                if recorder is not None:
+                    recorder.end_match()
+                return match.points_left, match.right_hits, round(frames)
+
+    @staticmethod
+    def recorder(path: str) -> "MatchRecorder":
+        """Returns the recorder of this process for given path (its own file in a pool worker)."""
+        from pong.model.MatchRecorder import MatchRecorder  # numpy, only imported when recording
+        if parent_process() is not None:
+            root, extension = os.path.splitext(path)
+            path = f"{root}-{os.getpid()}{extension}"
+        if path not in MatchEvaluator.recorders:
+            MatchEvaluator.recorders[path] = MatchRecorder(path)
+        return MatchEvaluator.recorders[path]
+
+    @staticmethod
+    def close_recorders():
+        """Closes the recorders of this process."""
+        for recorder in MatchEvaluator.recorders.values():
+            recorder.close()
+        MatchEvaluator.recorders.clear()
+
+    @staticmethod
+    def init_worker():
+        """Initializes a pool worker: close() only runs in the parent, its recorders are closed as it exits."""
+        util.Finalize(None, MatchEvaluator.close_recorders, exitpriority=10)
+
+    def match_seed(self, index: int) -> int:
+        """Returns the seed of the match at given index of the current generation (-1 for scheduling)."""
+        return hash((self.seed, self.generation, index)) & 0xFFFFFFFF
+
+    # ------- Helpers --------------------------------------
+
+    def __map(self, jobs) -> List[Tuple[int, int, int]]:
+        if self.workers <= 1:
+            return [self.play_counted(*job) for job in jobs]
+        if self.pool is None:
+            self.pool = Pool(self.workers, initializer=MatchEvaluator.init_worker)
+        chunksize = max(1, len(jobs) // (self.workers * 4))
+        return self.pool.starmap(MatchEvaluator.play_counted, jobs, chunksize)
@@ -0,0 +1,16 @@
+# package pong.AI
+import neat
+
+class PicklableReporter(neat.reporting.BaseReporter):
+    """
+    Base of reporters holding what cannot (or should not) be pickled: files, threads, callbacks.
+
+    Checkpoints pickle the species set, which holds the reporters, so every checkpoint
+    pickles them too. The attributes in UNPICKLED are left out, stored as the given value.
+    """
+    UNPICKLED = {}  # Attribute name -> value pickled in its place
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state.update(self.UNPICKLED)
+        return state
@@ -0,0 +1,115 @@
+# package pong.AI
+from typing import List, Sequence, Tuple
+import numpy as np
+
+Layer = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]  # targets, weights, bias, response
+
+class Policy:
+    """
+    A trained network compiled to a flat, versioned .npz file of layered weights.
+
+    Loading and evaluating a policy only needs numpy, no neat, config.ini or pickle.
+    Every layer computes its target node slots from all slots in one matrix product:
+    values[targets] = relu(bias + response * (values @ weights)), inputs being the
+    first slots and outputs the next ones, as in BatchNetwork.
+    """
+    VERSION = 1
+    INPUTS = ("paddle_y", "ball_y", "ball_distance_x")  # What the networks are fed, in order
+    OUTPUTS = ("keep", "up", "down")                    # Decision per output index
+
+    def __init__(self, layers: List[Layer], num_slots: int, inputs: Sequence[str] = INPUTS,
+                 outputs: Sequence[str] = OUTPUTS):
+        self.layers = layers
+        self.num_slots = num_slots
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        # Evaluation form: contiguous targets as slices, unit responses left out
+        self.steps = [
+            (self.__as_slice(targets), weights, bias, None if np.all(response == 1.0) else response)
+            for targets, weights, bias, response in layers
+        ]
+        self.values = np.zeros(num_slots)
+
+    @classmethod
+    def from_genome(cls, genome, config) -> "Policy":
+        """Compiles a NEAT genome (needs neat, unlike the rest of this class)."""
+        from pong.AI.BatchNetwork import BatchNetwork
+        network = BatchNetwork.create([genome], config)
+        if network.num_inputs != len(cls.INPUTS) or network.num_outputs != len(cls.OUTPUTS):
+            raise ValueError("Genome does not match the input and output schema")
+        layers = []
+        for l in range(network.weights.shape[1]):
+            targets = np.flatnonzero(network.layers[0, l])
+            if len(targets) == 0:
+                continue
+            layers.append((targets, network.weights[0, l][:, targets],
+                           network.bias[0, targets], network.response[0, targets]))
+        return cls(layers, network.bias.shape[1])
+
+    @classmethod
+    def load(cls, path: str) -> "Policy":
+        with np.load(path, allow_pickle=False) as data:
+            version = int(data["version"])
+            if version != cls.VERSION:
+                raise ValueError(f"Unsupported policy version {version} in {path}")
+            layers = [
+                (data[f"targets_{l}"], data[f"weights_{l}"], data[f"bias_{l}"], data[f"response_{l}"])
+                for l in range(int(data["num_layers"]))
+            ]
+            return cls(layers, int(data["num_slots"]), data["inputs"].tolist(), data["outputs"].tolist())
+
+    def save(self, path: str):
+        arrays = {
+            "version": np.array(self.VERSION),
+            "num_slots": np.array(self.num_slots),
+            "num_layers": np.array(len(self.layers)),
+            "inputs": np.array(self.inputs),
+            "outputs": np.array(self.outputs),
+        }
+        for l, (targets, weights, bias, response) in enumerate(self.layers):
+            arrays.update({f"targets_{l}": targets, f"weights_{l}": weights,
+                           f"bias_{l}": bias, f"response_{l}": response})
+        np.savez_compressed(path, **arrays)
+
+    def activate(self, inputs: Sequence[float]) -> np.ndarray:
+        """Returns the outputs for one input vector."""
+        values = self.values
+        # Other slots are either computed below before being read, or never computed (stay 0)
+        for i, value in enumerate(inputs):
+            values[i] = value
+        for targets, weights, bias, response in self.steps:
+            z = values @ weights
+            if response is not None:
+                z *= response
+            z += bias
+            values[targets] = np.maximum(z, 0.0, out=z)
+        return values[len(self.inputs):len(self.inputs) + len(self.outputs)]
+
+    def decide(self, inputs: Sequence[float]) -> int:
+        """Returns the decision (index of the largest output) for one input vector."""
+        return int(self.activate(inputs).argmax())
+
+    def activate_batch(self, inputs: np.ndarray) -> np.ndarray:
+        """Returns the outputs for a (batch, inputs) array, one row per input vector."""
+        values = np.zeros((len(inputs), self.num_slots))
+        values[:, :len(self.inputs)] = inputs
+        for targets, weights, bias, response in self.steps:
+            z = values @ weights
+            if response is not None:
+                z *= response
+            z += bias
+            values[:, targets] = np.maximum(z, 0.0, out=z)
+        return values[:, len(self.inputs):len(self.inputs) + len(self.outputs)]
+
+    def decide_batch(self, inputs: np.ndarray) -> np.ndarray:
+        """Returns the decision for every row of a (batch, inputs) array."""
+        return self.activate_batch(inputs).argmax(axis=1)
+
+    # ---------- Helpers ------------------------
+
+    @staticmethod
+    def __as_slice(targets: np.ndarray):
+        """Returns targets as a slice if contiguous, indexing with a slice is a lot cheaper."""
+        if len(targets) and np.array_equal(targets, np.arange(targets[0], targets[0] + len(targets))):
+            return slice(int(targets[0]), int(targets[0]) + len(targets))
+        return targets
@@ -1,108 +1,202 @@
 from pong.view.PongGUI import PongGUI
-from pong.view.theme.Cool import Cool
-from pong.view.theme.Duckie import Duckie
 from pong.model.Pong import Pong
+from pong.AI.Scheduler import RoundRobinScheduler, Scheduler
+from pong.perf.Profiler import Profiler
 from pong.model.Config import *
-import neat
+from typing import Tuple
 import pickle
 import os
 import pygame
+import random
+import time
 
 class PongAI(PongGUI):
     
     dir_path = os.path.dirname(os.path.realpath(__file__))
+
+    # ------- Training options -----------------------------
+    headless = False   # Train without touching pygame (no window, no frame cap)?
+    watch_every = 0    # When headless, render every Nth match (0 = never)
+    match_count = 0    # Matches played so far in this run
+    frame_count = 0    # Frames simulated so far in this run
+    decision_interval = 1  # Frames between network decisions of train_ai (and after every hit)
+    scheduler = RoundRobinScheduler()  # Decides who plays whom, see [PongAI] in config.ini
     
     @classmethod
-    def run_neat(cls, load_checkpoint: str = None):
-        if load_checkpoint is not None:
-            # Load from checkpoint
-            check_points_dir = os.path.join(cls.dir_path, "checkpoints")
-            checkpoint = os.path.join(check_points_dir, load_checkpoint)
-            p = neat.Checkpointer.restore_checkpoint(checkpoint)
+    def run_neat(cls, load_checkpoint: str = None, headless: bool = False, watch_every: int = 0,
+                 workers: int = None, batched: bool = False, decision_interval: int = 1,
+                 timestep: float = 1, timings: str = None, record: str = None):
+        """
+        Trains the AI. With workers set, matches are played headless by a MatchEvaluator
+        across that many processes (1 = in-process), where each update simulates timestep frames.
+        With batched, all matches of a generation are played at once by a BatchEvaluator.
+        Otherwise matches run one by one through train_ai. Either way the networks decide
+        every decision_interval frames (and after every hit).
+        With timings, per generation timings are written to that .csv or .jsonl file.
+        With record, every match is recorded to that file (see MatchRecorder).
+        """
+        # neat is only imported for training and playing against the AI
+        from pong.AI.Trainer import Trainer
+        cls.headless = headless
+        cls.watch_every = watch_every
+        cls.match_count = 0
+        cls.frame_count = 0
+        if batched or workers is not None:
+            Trainer.run_neat(load_checkpoint, workers=workers, batched=batched,
+                             decision_interval=decision_interval, timestep=timestep, timings=timings,
+                             record=record)
         else:
-            # Load from config file
-            config = cls.__load_config()
-            p = neat.Population(config)
-        
-        # Print Information
-        p.add_reporter(neat.StdOutReporter(True))
-        
-        # Statistics Reporter 
-        stats = neat.StatisticsReporter()
-        p.add_reporter(stats)
-        
-        # Save Checkpoints
-        check_points_dir = os.path.join(cls.dir_path, "checkpoints")
-        p.add_reporter(neat.Checkpointer(5, filename_prefix=check_points_dir + '/neat-checkpoint-')) # Save every 5 generations
-        
-        # Get the best genome
-        winner = p.run(cls.__eval_genomes, 50)
-        best_ai_object_path = os.path.join(cls.dir_path, "best_ai_object.pkl")
-        print("Saving best AI object to: " + best_ai_object_path)
-        with open(best_ai_object_path, 'wb') as output:
-            pickle.dump(winner, output)         
+            if timestep != 1:
+                raise ValueError("timestep needs a MatchEvaluator (workers)")
+            cls.decision_interval = decision_interval
+            cls.scheduler = Scheduler.from_config(Trainer.config_path())
+            if record is not None:
+                from pong.model.MatchRecorder import MatchRecorder  # numpy, only imported when recording
+                cls.recorder = MatchRecorder(record)
+            try:
+                Trainer.run_neat(load_checkpoint, fitness_function=cls.__eval_genomes, timings=timings,
+                                 counters=lambda: (cls.match_count, cls.frame_count))
+            finally:
+                if cls.recorder is not None:
+                    cls.recorder.close()
+                    cls.recorder = None
     
     @classmethod
-    def train_ai(cls, genome1, genome2, config):
+    def train_ai(cls, genome1, genome2, config) -> Tuple[int, int]:
+        """Plays genome1 (left) against genome2 (right), returns their fitness contributions."""
+        import neat
         net1 = neat.nn.FeedForwardNetwork.create(genome1, config)
         net2 = neat.nn.FeedForwardNetwork.create(genome2, config)
+        watch = cls.__should_watch()
+        cls.match_count += 1
                 
         # Load assets
         cls.running = True
-        cls.assets = Cool()
+        if watch and type(cls.assets) is not cls.theme:
+            cls.assets = cls.theme()
         Pong.load_entities()
         Pong.reset_points()
+        recorder = cls.recorder
+        if recorder is not None:
+            recorder.begin_match(Pong.match, cls.match_count)
+        profile = Profiler.enabled
+        decide_in = 0
         while cls.running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    quit()
+            if profile:
+                start = lap = time.perf_counter()
+            if watch:
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        quit()
+                if profile:
+                    lap = Profiler.lap("events", lap)
                          
-            output1 = net1.activate((Pong.left_paddle.y, Pong.ball.y, abs(Pong.ball.x - Pong.left_paddle.x)))
-            decision1 = output1.index(max(output1))
-            
-            if decision1 == 0:
-                pass
-            elif decision1 == 1:
-                cls.move_paddle(left=True, up=True)
-            else:
-                cls.move_paddle(left=True, up=False)
-                
-            
-            output2 = net2.activate((Pong.right_paddle.y, Pong.ball.y, abs(Pong.ball.x - Pong.right_paddle.x)))
-            decision2 = output2.index(max(output2))
-            
-            if decision2 == 0:
-                pass
-            elif decision2 == 1:
-                cls.move_paddle(left=False, up=True)
+            # The networks decide every decision_interval frames and right after a hit or point
+            if decide_in == 0:
+                output1 = net1.activate((Pong.left_paddle.y, Pong.ball.y, abs(Pong.ball.x - Pong.left_paddle.x)))
+                decision1 = output1.index(max(output1))
+
+                if decision1 == 0:
+                    pass
+                elif decision1 == 1:
+                    cls.move_paddle(left=True, up=True)
+                else:
+                    cls.move_paddle(left=True, up=False)
+
+                output2 = net2.activate((Pong.right_paddle.y, Pong.ball.y, abs(Pong.ball.x - Pong.right_paddle.x)))
+                decision2 = output2.index(max(output2))
+
+                if decision2 == 0:
+                    pass
+                elif decision2 == 1:
+                    cls.move_paddle(left=False, up=True)
+                else:
+                    cls.move_paddle(left=False, up=False)
+                decide_in = cls.decision_interval
             else:
-                cls.move_paddle(left=False, up=False)
-                
-            
+                decision1 = decision2 = NO_DECISION
+            if profile:
+                lap = Profiler.lap("activate", lap)
+
+            events = (Pong.left_hits, Pong.right_hits, Pong.points_left, Pong.points_right)
             Pong.update()
-            cls.render()
+            cls.frame_count += 1
+            decide_in -= 1
+            if events != (Pong.left_hits, Pong.right_hits, Pong.points_left, Pong.points_right):
+                decide_in = 0
+            if recorder is not None:
+                recorder.record(Pong.match, decision1, decision2)
+            if profile:
+                lap = Profiler.lap("update", lap)
+            if watch:
+                cls.render()
+                if profile:
+                    lap = Profiler.lap("render", lap)
             if Pong.points_left >= 1 or Pong.points_right >= 1 or Pong.left_hits > 50 or Pong.right_hits > 50:
-                cls.calculate_fitness(genome1, genome2)
-                break
-            cls.clock.tick(120)
+                if recorder is not None:
+                    recorder.end_match()
+                return cls.calculate_fitness()
+            if watch:
+                cls.clock.tick(120)
+                if profile:
+                    lap = Profiler.lap("tick", lap)
+            if profile:
+                Profiler.end_frame(start)
+
+    @classmethod
+    def __should_watch(cls) -> bool:
+        """Returns True if the next training match should be rendered."""
+        if not cls.headless:
+            return True
+        if cls.watch_every <= 0 or cls.match_count % cls.watch_every != 0:
+            return False
+        # Only open a window once a match is actually watched
+        if not pygame.display.get_init():
+            cls.init_pygame()
+        return True
             
     @classmethod
     def get_best_ai(cls):
         best_ai_object_path = os.path.join(cls.dir_path, "best_ai_object.pkl")
         return pickle.load(open(best_ai_object_path, 'rb'))
 
+    @classmethod
+    def __load_best_policy(cls):
+        """
+        Returns the decision function of the best AI: a network built from the pickled genome,
+        else, without neat, its exported Policy (see Trainer.export_policy).
+        The Policy only needs numpy, but numpy overhead makes it slower for one state at a time.
+        """
+        try:
+            import neat
+        except ImportError:
+            from pong.AI.Policy import Policy
+            return Policy.load(os.path.join(cls.dir_path, "best_ai_policy.npz")).decide
+
+        from pong.AI.Trainer import Trainer
+        net = neat.nn.FeedForwardNetwork.create(cls.get_best_ai(), Trainer.load_config())
+
+        def decide(inputs) -> int:
+            output = net.activate(inputs)
+            return output.index(max(output))
+        return decide
+
     @classmethod
     def test_ai(cls):
-        net = neat.nn.FeedForwardNetwork.create(cls.get_best_ai(), cls.__load_config())
+        decide = cls.__load_best_policy()
         
         # Load assets
         cls.running = True
-        cls.assets = Cool()
+        # The display first, so themes convert their images for it (see Assets.get_atlas)
         cls.init_pygame()
+        cls.assets = cls.theme()
         Pong.load_entities()
         Pong.reset_points()
 
+        profile = Profiler.enabled
         while cls.running:
+            if profile:
+                start = lap = time.perf_counter()
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     quit()
@@ -114,11 +208,12 @@ class PongAI(PongGUI):
                 cls.move_paddle(left=False, up=False)
             else:
                 Pong.right_paddle.accelerate(0,0)
+            if profile:
+                lap = Profiler.lap("events", lap)
 
             
                 
-            output = net.activate((Pong.left_paddle.y, Pong.ball.y, abs(Pong.ball.x - Pong.left_paddle.x)))
-            decision = output.index(max(output))
+            decision = decide((Pong.left_paddle.y, Pong.ball.y, abs(Pong.ball.x - Pong.left_paddle.x)))
             
             if decision == 0:
                 pass
@@ -126,43 +221,35 @@ class PongAI(PongGUI):
                 cls.move_paddle(left=True, up=True)
             else:
                 cls.move_paddle(left=True, up=False)
+            if profile:
+                lap = Profiler.lap("activate", lap)
 
             
             Pong.update()
+            if profile:
+                lap = Profiler.lap("update", lap)
             cls.render()
+            if profile:
+                lap = Profiler.lap("render", lap)
 
             cls.clock.tick(60)
+            if profile:
+                Profiler.lap("tick", lap)
+                Profiler.end_frame(start)
 
     @classmethod
-    def calculate_fitness(cls, genome1, genome2):
-        genome1.fitness += Pong.points_left
-        genome2.fitness += Pong.right_hits
+    def calculate_fitness(cls) -> Tuple[int, int]:
+        """Returns the fitness contributions of the left and right genome for the finished match."""
+        return Pong.points_left, Pong.right_hits
 
     @classmethod
     def __eval_genomes(cls, genomes, config):
         """Evaluates the genomes."""
-        cls.init_pygame()
-        
-        for i, (genome_id1 , genome1) in enumerate(genomes):
-            if i == len(genomes) - 1:
-                break
-            genome1.fitness = 0
-            
-            for genome_id2, genome2 in genomes[i+1:]:
-                genome2.fitness = 0 if genome2.fitness == None else genome2.fitness
-
-                cls.train_ai(genome1, genome2, config)
-            
-    @classmethod
-    def __load_config(cls):
-        local_dir = os.path.dirname(__file__)
-        config_pah = os.path.join(local_dir, 'config.ini')
-        
-        config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
-                             neat.DefaultSpeciesSet, neat.DefaultStagnation,
-                             config_pah
-                            )
-        return config
-    
+        if not cls.headless:
+            cls.init_pygame()
 
-    
\ No newline at end of file
+        cls.scheduler.evaluate(
+            genomes,
+            lambda pairs: [cls.train_ai(genome1, genome2, config) for genome1, genome2 in pairs],
+            random.Random()
+        )
@@ -0,0 +1,159 @@
+# package pong.AI
+from configparser import ConfigParser
+from typing import Callable, Iterator, List, Tuple
+import copy
+import random
+
+Pairs = List[Tuple[object, object]]
+
+class Scheduler:
+    """
+    Decides which genomes play each other during a generation.
+
+    A generation is played in rounds of (left genome, right genome) pairs, so schedulers
+    can pair on the results of earlier rounds. Fitness is the sum of the match contributions
+    divided by the number of matches played, which keeps schedulers comparable.
+    """
+    CONFIG_SECTION = "PongAI"
+
+    @classmethod
+    def from_config(cls, config_path: str) -> "Scheduler":
+        """Creates the scheduler configured in the [PongAI] section of given config file."""
+        parser = ConfigParser()
+        parser.read(config_path)
+        if not parser.has_section(cls.CONFIG_SECTION):
+            return RoundRobinScheduler()
+        section = parser[cls.CONFIG_SECTION]
+        name = section.get("scheduler", "round_robin")
+        matches = section.getint("matches_per_genome", 5)
+        if name == "round_robin":
+            return RoundRobinScheduler()
+        elif name == "random":
+            return RandomScheduler(matches)
+        elif name == "swiss":
+            return SwissScheduler(matches)
+        elif name == "hall_of_fame":
+            return HallOfFameScheduler(matches, section.getint("hall_of_fame_size", 10))
+        raise ValueError("Unknown scheduler: " + name)
+
+    def rounds(self, genomes, rng: random.Random) -> Iterator[Pairs]:
+        """Yields the pairs to play, round by round."""
+        raise NotImplementedError
+
+    def end_generation(self, genomes):
+        """Called once the fitness of all genomes is known."""
+        pass
+
+    def evaluate(self, genomes, play: Callable[[Pairs], List[Tuple[float, float]]], rng: random.Random):
+        """
+        Plays all rounds and sets the fitness of the genomes.
+        play receives the pairs of a round and returns the fitness contributions per pair.
+        """
+        played = {}
+        for _, genome in genomes:
+            genome.fitness = 0
+            played[id(genome)] = 0
+
+        for pairs in self.rounds(genomes, rng):
+            for (genome1, genome2), (fitness1, fitness2) in zip(pairs, play(pairs)):
+                # Opponents from outside the population (e.g. past champions) are not scored
+                if id(genome1) in played:
+                    genome1.fitness += fitness1
+                    played[id(genome1)] += 1
+                if id(genome2) in played:
+                    genome2.fitness += fitness2
+                    played[id(genome2)] += 1
+
+        for _, genome in genomes:
+            matches = played[id(genome)]
+            genome.fitness = genome.fitness / matches if matches else 0
+        self.end_generation(genomes)
+
+    # ------- Helpers --------------------------------------
+
+    @staticmethod
+    def random_pairs(population: list, rng: random.Random) -> Pairs:
+        """Pairs up the population at random, one genome sits out if the count is odd."""
+        shuffled = list(population)
+        rng.shuffle(shuffled)
+        return list(zip(shuffled[0::2], shuffled[1::2]))
+
+
+class RoundRobinScheduler(Scheduler):
+    """Every genome plays every other genome once, O(pop_size^2) matches."""
+
+    def rounds(self, genomes, rng: random.Random) -> Iterator[Pairs]:
+        population = [genome for _, genome in genomes]
+        yield [
+            (genome1, genome2)
+            for i, genome1 in enumerate(population)
+            for genome2 in population[i + 1:]
+        ]
+
+
+class RandomScheduler(Scheduler):
+    """Every genome plays matches_per_genome random opponents."""
+
+    def __init__(self, matches_per_genome: int):
+        self.matches_per_genome = matches_per_genome
+
+    def rounds(self, genomes, rng: random.Random) -> Iterator[Pairs]:
+        population = [genome for _, genome in genomes]
+        for _ in range(self.matches_per_genome):
+            yield self.random_pairs(population, rng)
+
+
+class SwissScheduler(Scheduler):
+    """
+    Swiss-style pairing: every round pairs genomes with similar fitness so far,
+    matches_per_genome rounds in total.
+    """
+
+    def __init__(self, matches_per_genome: int):
+        self.matches_per_genome = matches_per_genome
+
+    def rounds(self, genomes, rng: random.Random) -> Iterator[Pairs]:
+        population = [genome for _, genome in genomes]
+        for _ in range(self.matches_per_genome):
+            # Shuffle first so equal fitness is broken at random
+            ranked = list(population)
+            rng.shuffle(ranked)
+            ranked.sort(key=lambda genome: genome.fitness, reverse=True)
+            pairs = []
+            for genome1, genome2 in zip(ranked[0::2], ranked[1::2]):
+                # Left and right paddles score differently, so alternate sides at random
+                pairs.append((genome1, genome2) if rng.random() < 0.5 else (genome2, genome1))
+            yield pairs
+
+
+class HallOfFameScheduler(Scheduler):
+    """
+    Every genome plays matches_per_genome matches against past champions,
+    kept in an archive of the best genome of each of the last hall_of_fame_size generations.
+    Until the archive has a champion, genomes play random opponents instead.
+    """
+
+    def __init__(self, matches_per_genome: int, hall_of_fame_size: int):
+        self.matches_per_genome = matches_per_genome
+        self.hall_of_fame_size = hall_of_fame_size
+        self.hall_of_fame = []
+
+    def rounds(self, genomes, rng: random.Random) -> Iterator[Pairs]:
+        population = [genome for _, genome in genomes]
+        for _ in range(self.matches_per_genome):
+            if not self.hall_of_fame:
+                yield self.random_pairs(population, rng)
+                continue
+            pairs = []
+            for genome in population:
+                champion = rng.choice(self.hall_of_fame)
+                pairs.append((genome, champion) if rng.random() < 0.5 else (champion, genome))
+            yield pairs
+
+    def end_generation(self, genomes):
+        """Archives a copy of the best genome of the generation."""
+        if self.hall_of_fame_size <= 0:
+            return  # No archive, genomes keep playing random opponents
+        best = max((genome for _, genome in genomes), key=lambda genome: genome.fitness)
+        self.hall_of_fame.append(copy.deepcopy(best))
+        del self.hall_of_fame[:-self.hall_of_fame_size]
@@ -0,0 +1,120 @@
+# package pong.AI
+from collections import deque
+from typing import Dict, Iterator, List
+import copy
+import json
+from neat.math_util import mean, median2, stdev
+from pong.AI.PicklableReporter import PicklableReporter
+
+class StreamingStatisticsReporter(PicklableReporter):
+    """
+    Memory-bounded replacement for neat.StatisticsReporter.
+
+    Every generation a summary (best, mean, median and stdev fitness, species sizes
+    and fitness) is appended as one JSON line to path, and only the last window
+    summaries are kept in memory, along with a copy of the best genome so far.
+    The curves of a whole run, resumed runs included, are read back from the file
+    with the classmethods at the bottom.
+    """
+    WINDOW = 100
+    UNPICKLED = dict(file=None)
+
+    def __init__(self, path: str, window: int = WINDOW):
+        self.path = path
+        self.recent = deque(maxlen=window)
+        self.generation = None
+        self.best = None
+        self.file = None
+
+    def start_generation(self, generation):
+        self.generation = generation
+
+    def post_evaluate(self, config, population, species, best_genome):
+        fitnesses = [genome.fitness for genome in population.values()]
+        summary = {
+            "generation": self.generation,
+            "best": best_genome.fitness,
+            "best_key": best_genome.key,
+            "mean": mean(fitnesses),
+            "median": median2(fitnesses),
+            "stdev": stdev(fitnesses),
+            "species": {
+                str(sid): {
+                    "size": len(s.members),
+                    "fitness": mean([member.fitness for member in s.members.values()]),
+                }
+                for sid, s in species.species.items()
+            },
+        }
+        if self.best is None or best_genome.fitness > self.best.fitness:
+            self.best = copy.deepcopy(best_genome)
+        self.recent.append(summary)
+        self.__write(summary)
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    # -------------- Window of recent generations -----------------------------
+
+    def best_genome(self):
+        """Returns the best genome seen by this reporter."""
+        return self.best
+
+    def get_fitness_mean(self) -> List[float]:
+        return [summary["mean"] for summary in self.recent]
+
+    def get_fitness_stdev(self) -> List[float]:
+        return [summary["stdev"] for summary in self.recent]
+
+    def get_fitness_median(self) -> List[float]:
+        return [summary["median"] for summary in self.recent]
+
+    # -------------- Reading the stream -----------------------------
+
+    @classmethod
+    def read(cls, path: str) -> Iterator[dict]:
+        """Yields the generation summaries of given file one by one, without loading it all."""
+        with open(path) as file:
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+
+    @classmethod
+    def summaries(cls, path: str) -> List[dict]:
+        """
+        Returns the summaries of the run as it continued: a run resumed from a checkpoint
+        replaces the generations it repeats.
+        """
+        summaries = []
+        for summary in cls.read(path):
+            while summaries and summaries[-1]["generation"] >= summary["generation"]:
+                summaries.pop()
+            summaries.append(summary)
+        return summaries
+
+    @classmethod
+    def fitness_curves(cls, path: str) -> Dict[str, List[float]]:
+        """Returns the generation, best, mean, median and stdev curves of given file."""
+        curves = {"generation": [], "best": [], "mean": [], "median": [], "stdev": []}
+        for summary in cls.summaries(path):
+            for name, values in curves.items():
+                values.append(summary[name])
+        return curves
+
+    @classmethod
+    def species_sizes(cls, path: str) -> List[List[int]]:
+        """Returns the size of every species per generation (0 when absent), like StatisticsReporter."""
+        sizes = [{int(sid): s["size"] for sid, s in summary["species"].items()} for summary in cls.summaries(path)]
+        max_sid = max((max(generation, default=0) for generation in sizes), default=0)
+        return [[generation.get(sid, 0) for sid in range(1, max_sid + 1)] for generation in sizes]
+
+    # ---------- Helpers ------------------------
+
+    def __write(self, summary: dict):
+        # Opened lazily in append mode, so resumed runs continue the same stream
+        if self.file is None:
+            self.file = open(self.path, "a")
+        self.file.write(json.dumps(summary) + "\n")
+        self.file.flush()
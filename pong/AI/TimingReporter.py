@@ -0,0 +1,98 @@
+# package pong.AI
+from time import perf_counter
+from typing import Callable, Optional, Tuple
+import csv
+import json
+import time
+from pong.AI.PicklableReporter import PicklableReporter
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+class TimingReporter(PicklableReporter):
+    """
+    Records where the time of every generation goes, streamed to a CSV or JSONL file
+    (by extension) as the run goes.
+
+    eval_s is the fitness evaluation, breed_s reproduction and speciation, and report_s
+    what the other reporters do at the end of a generation (mainly checkpointing).
+    Add it before the other reporters, so its hooks run first. Matches and simulated
+    frames come from counters, a function returning the totals so far.
+    """
+    FIELDS = [
+        "generation", "time", "population", "eval_s", "breed_s", "report_s", "total_s",
+        "matches", "frames", "matches_per_sec", "frames_per_sec", "peak_rss_mb", "children_peak_rss_mb",
+    ]
+    UNPICKLED = dict(file=None, writer=None, counters=None, row=None)
+
+    def __init__(self, path: str, counters: Callable[[], Tuple[int, int]] = None):
+        self.path = path
+        self.counters = counters
+        self.jsonl = path.endswith(".jsonl")
+        self.file = open(path, "w", newline="")
+        self.writer = None if self.jsonl else csv.DictWriter(self.file, self.FIELDS)
+        if self.writer is not None:
+            self.writer.writeheader()
+        self.row = None
+        self.totals = (0, 0)
+
+    def start_generation(self, generation):
+        now = perf_counter()
+        self.__flush(now)
+        self.totals = self.__counters()
+        self.row = {"generation": generation, "time": time.time(), "start": now}
+
+    def post_evaluate(self, config, population, species, best_genome):
+        self.row["evaluated"] = perf_counter()
+        self.row["population"] = len(population)
+
+    def end_generation(self, config, population, species_set):
+        self.row["bred"] = perf_counter()
+
+    def close(self):
+        """Writes the last generation and closes the file."""
+        if self.file is None:
+            return
+        self.__flush(perf_counter())
+        self.file.close()
+
+    # ---------- Helpers ------------------------
+
+    def __counters(self) -> Tuple[int, int]:
+        return (0, 0) if self.counters is None else self.counters()
+
+    def __flush(self, now: float):
+        """Writes the row of the finished generation, if any."""
+        row = self.row
+        if row is None or "evaluated" not in row:
+            return
+        matches, frames = (total - before for total, before in zip(self.__counters(), self.totals))
+        evaluated = row.pop("evaluated")
+        eval_s = evaluated - row["start"]
+        # A generation reaching the fitness threshold ends right after evaluation
+        bred = row.pop("bred", evaluated)
+        row.update({
+            "eval_s": eval_s,
+            "breed_s": bred - row["start"] - eval_s,
+            "report_s": now - bred,
+            "total_s": now - row.pop("start"),
+            "matches": matches,
+            "frames": frames,
+            "matches_per_sec": matches / eval_s if eval_s > 0 else 0,
+            "frames_per_sec": frames / eval_s if eval_s > 0 else 0,
+            "peak_rss_mb": self.__peak_rss(resource.RUSAGE_SELF) if resource else None,
+            "children_peak_rss_mb": self.__peak_rss(resource.RUSAGE_CHILDREN) if resource else None,
+        })
+        if self.jsonl:
+            self.file.write(json.dumps(row) + "\n")
+        else:
+            self.writer.writerow(row)
+        self.file.flush()
+        self.row = None
+
+    @staticmethod
+    def __peak_rss(who: int) -> Optional[float]:
+        """Peak resident set size in MB (ru_maxrss is in KB on Linux)."""
+        return resource.getrusage(who).ru_maxrss / 1024
@@ -0,0 +1,142 @@
+# package pong.AI
+from configparser import ConfigParser
+from pong.AI.AsyncCheckpointer import AsyncCheckpointer
+from pong.AI.MatchEvaluator import MatchEvaluator
+from pong.AI.Scheduler import Scheduler
+from pong.AI.StreamingStatisticsReporter import StreamingStatisticsReporter
+from pong.AI.TimingReporter import TimingReporter
+import neat
+import pickle
+import os
+
+class Trainer:
+    """
+    Runs the NEAT training loop, without any pygame.
+
+    Headless training (MatchEvaluator, BatchEvaluator) goes through here directly,
+    so neither the trainer nor its worker processes pay for importing pygame.
+    PongAI uses it too, passing its own (rendering) fitness function.
+    """
+    dir_path = os.path.dirname(os.path.realpath(__file__))
+    GENERATIONS = 50
+
+    @classmethod
+    def run_neat(cls, load_checkpoint: str = None, fitness_function=None, workers: int = None,
+                 batched: bool = False, decision_interval: int = 1, timestep: float = 1,
+                 timings: str = None, counters=None, record: str = None):
+        """
+        Trains the AI and saves the winner to best_ai_object.pkl.
+        Genomes are evaluated by fitness_function if given, otherwise by a BatchEvaluator
+        if batched, otherwise by a MatchEvaluator with given workers (None = all cores).
+        With timings, per generation timings are written to that .csv or .jsonl file,
+        counting matches and frames through counters (the evaluator's by default).
+        With record, the MatchEvaluator records every match to that file (see MatchRecorder).
+        """
+        if record is not None and (fitness_function is not None or batched):
+            raise ValueError("Only matches played by a MatchEvaluator can be recorded here")
+        if fitness_function is not None and (decision_interval != 1 or timestep != 1):
+            raise ValueError("decision_interval and timestep are up to the fitness_function")
+        if batched and timestep != 1:
+            raise ValueError("The BatchEvaluator only simulates one frame per step")
+        if fitness_function is not None:
+            evaluator = None
+        elif batched:
+            # numpy is only needed (and imported) for batched training
+            from pong.AI.BatchEvaluator import BatchEvaluator
+            evaluator = BatchEvaluator(scheduler=Scheduler.from_config(cls.config_path()),
+                                       decision_interval=decision_interval)
+        else:
+            evaluator = MatchEvaluator(workers, scheduler=Scheduler.from_config(cls.config_path()),
+                                       decision_interval=decision_interval, timestep=timestep, record=record)
+
+        reporters = []
+        if timings is not None:
+            reporters.append(TimingReporter(timings, counters if evaluator is None else evaluator.counters))
+        reporters.append(StreamingStatisticsReporter(cls.statistics_path()))
+        reporters.append(cls.create_checkpointer())
+        p = cls.create_population(load_checkpoint, reporters)
+
+        try:
+            winner = p.run(fitness_function if evaluator is None else evaluator, cls.GENERATIONS)
+        finally:
+            if evaluator is not None:
+                evaluator.close()
+            for reporter in reporters:
+                reporter.close()
+        cls.save_winner(winner)
+
+    @classmethod
+    def create_population(cls, load_checkpoint: str = None, reporters=()) -> neat.Population:
+        """
+        Returns the population from given checkpoint (or a new one), with given reporters
+        attached first, then the standard output reporter.
+        """
+        if load_checkpoint is not None:
+            # Load from checkpoint
+            checkpoint = os.path.join(cls.checkpoints_path(), load_checkpoint)
+            p = AsyncCheckpointer.restore_checkpoint(checkpoint)
+        else:
+            # Load from config file
+            p = neat.Population(cls.load_config())
+
+        for reporter in reporters:
+            p.add_reporter(reporter)
+
+        # Print Information
+        p.add_reporter(neat.StdOutReporter(True))
+        return p
+
+    @classmethod
+    def create_checkpointer(cls) -> AsyncCheckpointer:
+        """Saves every 5 generations, see [PongAI] in config.ini for deltas and retention."""
+        parser = ConfigParser()
+        parser.read(cls.config_path())
+        section = parser[Scheduler.CONFIG_SECTION] if parser.has_section(Scheduler.CONFIG_SECTION) else {}
+        full_every = int(section.get("checkpoint_full_every", 0))
+        return AsyncCheckpointer(
+            cls.checkpoints_path(), 5,
+            full_every=full_every if full_every > 0 else None,
+            keep_last=int(section.get("checkpoint_keep_last", 3)),
+            keep_every=int(section.get("checkpoint_keep_every", 25)),
+        )
+
+    @classmethod
+    def checkpoints_path(cls) -> str:
+        return os.path.join(cls.dir_path, "checkpoints")
+
+    @classmethod
+    def save_winner(cls, winner):
+        best_ai_object_path = os.path.join(cls.dir_path, "best_ai_object.pkl")
+        print("Saving best AI object to: " + best_ai_object_path)
+        with open(best_ai_object_path, 'wb') as output:
+            pickle.dump(winner, output)
+        cls.export_policy(winner)
+
+    @classmethod
+    def export_policy(cls, genome=None) -> str:
+        """Compiles given genome (default: the saved best AI) to best_ai_policy.npz, returns its path."""
+        from pong.AI.Policy import Policy  # numpy is only needed (and imported) for exporting
+        if genome is None:
+            with open(os.path.join(cls.dir_path, "best_ai_object.pkl"), 'rb') as file:
+                genome = pickle.load(file)
+        policy_path = os.path.join(cls.dir_path, "best_ai_policy.npz")
+        print("Saving best AI policy to: " + policy_path)
+        Policy.from_genome(genome, cls.load_config()).save(policy_path)
+        return policy_path
+
+    @classmethod
+    def statistics_path(cls) -> str:
+        """Per generation statistics, appended to by every run (see StreamingStatisticsReporter)."""
+        return os.path.join(cls.checkpoints_path(), "statistics.jsonl")
+
+    @classmethod
+    def config_path(cls) -> str:
+        return os.path.join(cls.dir_path, 'config.ini')
+
+    @classmethod
+    def load_config(cls):
+        config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                             neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                             cls.config_path()
+                            )
+        return config
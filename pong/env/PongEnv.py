@@ -0,0 +1,118 @@
+# package pong.env
+from typing import Tuple
+import numpy as np
+from pong.model.PongBatch import PongBatch
+
+class PongEnv:
+    """
+    Vectorized environment over n matches of a PongBatch, for training agents outside NEAT.
+
+    step takes an (n, 2) array of actions (left, right paddle; 0 keep, 1 up, 2 down, as the
+    AI decisions) and returns (observations, rewards, terminated, truncated). These are
+    preallocated buffers, overwritten by the next step: copy what you keep.
+
+    Observations are float32 of shape (n, 2, features), one row per paddle with the features
+    train_ai feeds the networks (FEATURES), followed by the velocities (VELOCITIES) if asked.
+    A rally ends (terminated) on touchdown, +1 reward to the side scoring and -1 to the other,
+    or is cut off (truncated) after max_hits hits of a paddle, like in training.
+    Finished matches are served again within the same step, so their observations are
+    the first of the next rally, and points keep adding up across rallies until reset.
+    """
+    FEATURES = ("paddle_y", "ball_y", "ball_distance_x")
+    VELOCITIES = ("paddle_dy", "ball_dx", "ball_dy")
+    NUM_ACTIONS = 3
+    MAX_HITS = 50
+    # Rewards of (left, right) per value returned by PongBatch.step: none, left scored, right scored
+    SCORE_REWARDS = np.array([[0, 0], [1, -1], [-1, 1]], dtype=np.float32)
+
+    def __init__(self, n: int, seed: int = None, velocities: bool = False, hit_reward: float = 0.0,
+                 max_hits: int = MAX_HITS):
+        self.n = n
+        self.batch = PongBatch(n, seed=seed)
+        self.velocities = velocities
+        self.hit_reward = hit_reward
+        self.max_hits = max_hits
+        self.features = self.FEATURES + (self.VELOCITIES if velocities else ())
+
+        self.observations = np.zeros((n, 2, len(self.features)), dtype=np.float32)
+        self.rewards = np.zeros((n, 2), dtype=np.float32)
+        self.terminated = np.zeros(n, dtype=bool)
+        self.truncated = np.zeros(n, dtype=bool)
+        self.episode_hits = np.zeros((n, 2), dtype=np.int64)  # Hits of the rallies that just ended
+        self.steps = 0       # step calls since creation
+        self.episodes = 0    # Rallies ended since creation
+        # Work buffers
+        self.active = np.ones(n, dtype=bool)
+        self.previous_hits = np.zeros((n, 2), dtype=np.int64)
+        self.new_hits = np.zeros((n, 2), dtype=np.int64)
+        self.over_max_hits = np.zeros((n, 2), dtype=bool)
+        self.done = np.zeros(n, dtype=bool)
+
+    def reset(self, seed: int = None) -> np.ndarray:
+        """Starts all matches over (reseeding the serves if seed given), returns the observations."""
+        if seed is not None:
+            self.batch.rng = np.random.default_rng(seed)
+        self.batch.reset()
+        self.rewards.fill(0)
+        self.terminated.fill(False)
+        self.truncated.fill(False)
+        self.__observe()
+        return self.observations
+
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Advances every match by one frame, see the class description for the results."""
+        batch = self.batch
+        np.copyto(self.previous_hits, batch.hits)
+        scored = batch.step(actions, self.active)
+
+        # Touchdown: PongBatch has scored the point, cleared the hits and served again
+        np.not_equal(scored, 0, out=self.terminated)
+        np.greater(batch.hits, self.max_hits, out=self.over_max_hits)
+        np.any(self.over_max_hits, axis=1, out=self.truncated)
+        np.logical_or(self.terminated, self.truncated, out=self.done)
+
+        np.take(self.SCORE_REWARDS, scored, axis=0, out=self.rewards)
+        if self.hit_reward:
+            # Hits are cleared on touchdown, which counts as no new hit
+            np.subtract(batch.hits, self.previous_hits, out=self.new_hits)
+            np.maximum(self.new_hits, 0, out=self.new_hits)
+            self.rewards += self.hit_reward * self.new_hits
+
+        if self.done.any():
+            np.copyto(self.episode_hits, batch.hits)
+            np.copyto(self.episode_hits, self.previous_hits, where=self.terminated[:, None])
+            self.episodes += int(np.count_nonzero(self.done))
+            if self.truncated.any():
+                truncated = self.truncated
+                batch.hits[truncated] = 0
+                batch.last_hit[truncated] = PongBatch.NO_HIT
+                batch.load_entities(truncated)
+
+        self.steps += 1
+        self.__observe()
+        return self.observations, self.rewards, self.terminated, self.truncated
+
+    def get_points(self) -> np.ndarray:
+        """Returns the (n, 2) points of the left and right paddles since reset (live view)."""
+        return self.batch.points
+
+    def get_hits(self) -> np.ndarray:
+        """Returns the (n, 2) hits of the left and right paddles in the current rallies (live view)."""
+        return self.batch.hits
+
+    # ---------- Helpers ------------------------
+
+    def __observe(self):
+        """Writes the features of both paddles into the observation buffer."""
+        batch = self.batch
+        observations = self.observations
+        for side in (0, 1):
+            features = observations[:, side]
+            features[:, 0] = batch.paddle_y[:, side]
+            features[:, 1] = batch.ball_y
+            np.subtract(batch.ball_x, PongBatch.PADDLE_X[side], out=features[:, 2])
+            np.abs(features[:, 2], out=features[:, 2])
+            if self.velocities:
+                features[:, 3] = batch.paddle_dy[:, side]
+                features[:, 4] = batch.ball_dx
+                features[:, 5] = batch.ball_dy
@@ -0,0 +1,284 @@
+# package pong.env
+from typing import Dict, Iterable, Iterator, List
+import glob
+import json
+import os
+import numpy as np
+from pong.env.PongEnv import PongEnv
+from pong.model.Config import *
+from pong.model.MatchRecorder import MatchRecorder
+
+Block = Dict[str, np.ndarray]
+
+class TrajectoryDataset:
+    """
+    (observation, action, outcome) samples for behaviour cloning, exported to shards.
+
+    Sources are generators of blocks, dicts of equally long arrays (FIELDS): the saved
+    champion playing itself on a PongEnv (champion) and recorded matches, e.g. human
+    games from run.py play --record (recordings). export streams any chain of them into
+    .npz shards of at most shard_bytes, load iterates the shards back one at a time,
+    so memory stays constant however many frames go through.
+
+    A sample is what one paddle saw (PongEnv observation) and did (0 keep, 1 up, 2 down)
+    in a frame. An episode is one paddle's rally, its samples are contiguous and share
+    the outcome: 1 won the point, -1 lost it, 0 cut off (max hits, end of match).
+    Episode 2 * r is the left paddle in rally r, 2 * r + 1 the right one. Sources number
+    their rallies from 0, export numbers them on from the rallies already in the directory.
+    """
+    FIELDS = ("observations", "actions", "outcomes", "episodes")
+    SHARD_BYTES = 64 * 2**20
+    BLOCK_FRAMES = 256     # Frames per block of the champion source
+    CHUNK_RECORDS = 2**20  # Records per block of the recordings source
+    MANIFEST = "manifest.jsonl"
+
+    # -------------- Sources -----------------------------
+
+    @classmethod
+    def champion(cls, frames: int, policy_path: str = None, matches: int = 256, seed: int = 0,
+                 velocities: bool = False) -> Iterator[Block]:
+        """
+        Yields the samples of about given number of frames (two samples each) of the
+        exported best AI (best_ai_policy.npz by default) playing itself in parallel matches.
+        """
+        from pong.AI.Policy import Policy
+        if policy_path is None:
+            from pong.AI.Trainer import Trainer
+            policy_path = os.path.join(Trainer.dir_path, "best_ai_policy.npz")
+        policy = Policy.load(policy_path)
+        inputs = len(policy.inputs)
+
+        env = PongEnv(matches, seed=seed, velocities=velocities)
+        observations = env.reset()
+        # Per step, match and side (time major), reused for every block
+        shape = (cls.BLOCK_FRAMES, matches, 2)
+        block_observations = np.empty(shape + (len(env.features),), dtype=np.float32)
+        block_actions = np.empty(shape, dtype=np.int8)
+        block_rallies = np.empty(shape, dtype=np.int64)
+        block_results = np.zeros(shape, dtype=np.int8)
+        block_ends = np.zeros(shape, dtype=bool)
+        rallies = np.arange(matches)
+        next_rally = matches
+        actions = np.empty((matches, 2), dtype=np.int64)
+
+        def samples():
+            nonlocal observations, next_rally
+            produced = 0
+            while produced < frames:
+                for t in range(cls.BLOCK_FRAMES):
+                    for side in (0, 1):
+                        actions[:, side] = policy.decide_batch(observations[:, side, :inputs])
+                    block_observations[t] = observations
+                    block_actions[t] = actions
+                    block_rallies[t] = rallies[:, None]
+                    observations, rewards, terminated, truncated = env.step(actions)
+                    # Results are from the left paddle's view (see __with_outcomes)
+                    np.copyto(block_results[t], rewards[:, :1], casting="unsafe")
+                    done = terminated | truncated
+                    block_ends[t] = done[:, None]
+                    if done.any():
+                        count = int(np.count_nonzero(done))
+                        rallies[done] = np.arange(next_rally, next_rally + count)
+                        next_rally += count
+                produced += cls.BLOCK_FRAMES * matches
+                sides = np.broadcast_to(np.arange(2), shape)
+                yield {
+                    "observations": block_observations.reshape(-1, len(env.features)),
+                    "actions": block_actions.ravel(),
+                    "episodes": (2 * block_rallies + sides).ravel(),
+                    "results": block_results.ravel(),
+                    "ends": block_ends.ravel(),
+                }
+        return cls.__with_outcomes(samples())
+
+    @classmethod
+    def recordings(cls, paths: Iterable[str], velocities: bool = False) -> Iterator[Block]:
+        """
+        Yields the samples of both paddles in every frame of given recordings (see MatchRecorder).
+        Decisions not recorded (human players) are derived from the paddle speed: up or
+        down when it starts moving that way, keep otherwise (stopping is not an AI action).
+        """
+        def samples():
+            rally_offset = 0  # Rallies started so far
+            for path in paths:
+                records = MatchRecorder.read(path)
+                for start in range(0, len(records) - 1, cls.CHUNK_RECORDS):
+                    chunk = records[start:start + cls.CHUNK_RECORDS + 2]
+                    yield cls.__recording_samples(chunk, rally_offset, velocities)
+                    rally_offset += int(np.count_nonzero(cls.__rally_starts(chunk[:cls.CHUNK_RECORDS])))
+        return cls.__with_outcomes(samples())
+
+    # -------------- Shards -----------------------------
+
+    @classmethod
+    def export(cls, blocks: Iterable[Block], directory: str, shard_bytes: int = SHARD_BYTES) -> int:
+        """
+        Writes the blocks to shard-NNNNN.npz files of at most shard_bytes in directory,
+        listed in its manifest. Adds to the shards already there. Returns the samples written.
+        """
+        os.makedirs(directory, exist_ok=True)
+        shard = len(cls.shards(directory))
+        rally_offset = cls.__rallies(directory)
+        buffers = None
+        count = total = 0
+        for block in blocks:
+            # Both sides of a rally end together, so a block has whole rallies: number them on
+            rallies, renumbered = np.unique(block["episodes"] // 2, return_inverse=True)
+            block = dict(block, episodes=2 * (rally_offset + renumbered) + block["episodes"] % 2)
+            rally_offset += len(rallies)
+            if buffers is None:
+                per_sample = sum(block[name][:1].nbytes for name in cls.FIELDS)
+                # Leaving room for the .npz headers
+                capacity = max(1, (shard_bytes - 4096) // per_sample)
+                buffers = {name: np.empty((capacity,) + block[name].shape[1:], dtype=block[name].dtype)
+                           for name in cls.FIELDS}
+            size, offset = len(block["actions"]), 0
+            while offset < size:
+                taken = min(size - offset, capacity - count)
+                for name in cls.FIELDS:
+                    buffers[name][count:count + taken] = block[name][offset:offset + taken]
+                count += taken
+                offset += taken
+                if count == capacity:
+                    cls.__write_shard(directory, shard, buffers, count)
+                    shard += 1
+                    total += count
+                    count = 0
+        if count:
+            cls.__write_shard(directory, shard, buffers, count)
+            total += count
+        return total
+
+    @classmethod
+    def load(cls, directory: str, batch_size: int = None) -> Iterator[Block]:
+        """
+        Yields the samples of the shards in directory, a shard (or batch_size samples
+        of it, less at its end) at a time. Only one shard is in memory at once.
+        """
+        for name in cls.shards(directory):
+            with np.load(os.path.join(directory, name)) as shard:
+                block = {field: shard[field] for field in cls.FIELDS}
+            if batch_size is None:
+                yield block
+                continue
+            for start in range(0, len(block["actions"]), batch_size):
+                yield {field: values[start:start + batch_size] for field, values in block.items()}
+
+    @classmethod
+    def shards(cls, directory: str) -> List[str]:
+        """Returns the shard file names in directory, in order."""
+        return sorted(os.path.basename(path) for path in glob.glob(os.path.join(directory, "shard-*.npz")))
+
+    @classmethod
+    def size(cls, directory: str) -> int:
+        """Returns the number of samples in directory, from its manifest."""
+        manifest = os.path.join(directory, cls.MANIFEST)
+        if not os.path.exists(manifest):
+            return 0
+        with open(manifest) as file:
+            return sum(json.loads(line)["samples"] for line in file if line.strip())
+
+    # ---------- Helpers ------------------------
+
+    @classmethod
+    def __with_outcomes(cls, blocks: Iterator[Block]) -> Iterator[Block]:
+        """
+        Holds samples back until their episode ends, then yields them grouped by episode
+        (in order), with the outcome of the episode. Blocks have episodes, results and
+        ends (result at the last sample of an episode: 1 left scored, -1 right scored).
+        Episodes still running when the source ends are dropped.
+        """
+        carry = None
+        for block in blocks:
+            if carry is not None:
+                block = {name: np.concatenate((carry[name], values)) for name, values in block.items()}
+            episodes = block["episodes"]
+            ends = block["ends"]
+            ended = episodes[ends]
+            order = np.argsort(ended)
+            ended, results = ended[order], block["results"][ends][order]
+            position = np.minimum(np.searchsorted(ended, episodes), max(len(ended) - 1, 0))
+            complete = ended[position] == episodes if len(ended) else np.zeros(len(episodes), dtype=bool)
+
+            carry = {name: values[~complete] for name, values in block.items()}
+            if not complete.any():
+                continue
+            # Stable, so every episode keeps its samples in order
+            order = np.argsort(episodes[complete], kind="stable")
+            outcomes = results[position[complete]][order]
+            # Results are from the left paddle's view, odd episodes are the right paddle
+            outcomes = np.where(episodes[complete][order] % 2 == 1, -outcomes, outcomes).astype(np.int8)
+            yield {
+                "observations": block["observations"][complete][order],
+                "actions": block["actions"][complete][order],
+                "outcomes": outcomes,
+                "episodes": episodes[complete][order],
+            }
+
+    @classmethod
+    def __recording_samples(cls, records: np.ndarray, rally_offset: int, velocities: bool) -> Block:
+        """
+        Returns the samples of the first CHUNK_RECORDS records (all but the last at the end
+        of a file), the two records after them only tell their decisions and whether their
+        rallies end. A record is a sample unless it is the last of its match, as the decision
+        taken on it is in the next record. rally_offset is the number of rallies started before.
+        """
+        count = min(len(records) - 1, cls.CHUNK_RECORDS)
+        current, following, after = records[:count], records[1:count + 1], records[2:count + 2]
+        paired = following["frame"] != 0
+        point = following["events"] & MatchRecorder.POINT != 0
+        # A rally ends with a point, or is cut off when the match ends (unknown at the end of the file)
+        ends = point.copy()
+        ends[:len(after)] |= after["frame"] == 0
+        results = np.where(point, np.where(following["points_left"] > current["points_left"], 1, -1), 0)
+        rallies = rally_offset + np.cumsum(cls.__rally_starts(current)) - 1
+
+        observations = np.empty((count, 2, 6 if velocities else 3), dtype=np.float32)
+        actions = np.empty((count, 2), dtype=np.int8)
+        for side, paddle, paddle_x in ((0, "left", 0), (1, "right", GAME_WIDTH - PADDLE_WIDTH)):
+            observations[:, side, 0] = current[f"{paddle}_y"]
+            observations[:, side, 1] = current["ball_y"]
+            observations[:, side, 2] = np.abs(current["ball_x"] - paddle_x)
+            if velocities:
+                observations[:, side, 3] = current[f"{paddle}_dy"]
+                observations[:, side, 4] = current["ball_dx"]
+                observations[:, side, 5] = current["ball_dy"]
+            speed, next_speed = current[f"{paddle}_dy"], following[f"{paddle}_dy"]
+            derived = np.where(next_speed == speed, 0, np.where(next_speed < 0, 1, np.where(next_speed > 0, 2, 0)))
+            decisions = following[f"decision_{paddle}"]
+            actions[:, side] = np.where(decisions == MatchRecorder.NO_DECISION, derived, decisions)
+
+        keep = np.repeat(paired, 2)
+        return {
+            "observations": observations.reshape(count * 2, -1)[keep],
+            "actions": actions.ravel()[keep],
+            "episodes": (2 * rallies[:, None] + np.arange(2)).ravel()[keep],
+            "results": np.repeat(results, 2)[keep],
+            "ends": np.repeat(ends, 2)[keep],
+        }
+
+    @staticmethod
+    def __rally_starts(records: np.ndarray) -> np.ndarray:
+        """Returns which records start a rally: the first of a match, or a new serve."""
+        return (records["frame"] == 0) | (records["events"] & MatchRecorder.POINT != 0)
+
+    @classmethod
+    def __rallies(cls, directory: str) -> int:
+        """Returns the number of the first rally not in the shards of directory, from its manifest."""
+        manifest = os.path.join(directory, cls.MANIFEST)
+        if not os.path.exists(manifest):
+            return 0
+        with open(manifest) as file:
+            return max((json.loads(line).get("rallies", 0) for line in file if line.strip()), default=0)
+
+    @classmethod
+    def __write_shard(cls, directory: str, shard: int, buffers: Block, count: int):
+        name = f"shard-{shard:05d}.npz"
+        path = os.path.join(directory, name)
+        # Written under a temporary name, so a shard listed is always complete
+        with open(path + ".tmp", "wb") as output:
+            np.savez(output, **{field: values[:count] for field, values in buffers.items()})
+        os.replace(path + ".tmp", path)
+        rallies = int(buffers["episodes"][:count].max()) // 2 + 1
+        with open(os.path.join(directory, cls.MANIFEST), "a") as manifest:
+            manifest.write(json.dumps({"shard": name, "samples": count, "rallies": rallies}) + "\n")
@@ -8,29 +8,89 @@ from pong.event.ModelEvent import ModelEvent
 # GUI must know if there has been a collision in the model etc.
 # 
 # NOTE: Events **from GUI** to model handled by JavaFX events and keyboard listeners etc.
-# 
-# *** Nothing to do here ****
+#
+# Handlers are kept in a table per event type, so publishing a type nobody
+# listens to (e.g. in headless training) is a single dict lookup.
+# Events without data are reused, handlers must not keep them.
+# With deferred set, events are queued and dispatched by drain(), called
+# once per frame by the game loop, so stepping the model runs no handlers.
 class EventBus:
 
-    handlers = []
+    handlers = []       # (handler, event types or None for all types), in registration order
+    by_type = {}        # Event type -> callbacks, rebuilt on (un)registration
     trace = False
+    deferred = False
+    queue = []
+    events = {}         # Event type -> reused event without data
 
     @classmethod
-    def register(cls, handler: EventHandler):
-        cls.handlers.append(handler)
+    def register(cls, handler: EventHandler, *event_types: ModelEvent.EventType):
+        """Registers handler for given event types, all types if none given."""
+        cls.handlers.append((handler, event_types or None))
+        cls.__rebuild()
 
     @classmethod
     def unregister(cls, handler: EventHandler):
-        cls.handlers.remove(handler)
+        registration = next(((h, types) for h, types in cls.handlers if h is handler), None)
+        if registration is None:
+            raise ValueError(f"Handler not registered: {handler!r}")
+        cls.handlers.remove(registration)
+        cls.__rebuild()
+
+    @classmethod
+    def set_trace(cls, trace: bool):
+        """Prints every published event (including those nobody listens to)."""
+        cls.trace = trace
+        cls.__rebuild()
 
     @classmethod
     def publish(cls, evt: ModelEvent):
-        # Tracking all events
-        if cls.trace:
-            print(evt)
-        for evh in cls.handlers:
-            evh.on_model_event(evt)
+        callbacks = cls.by_type.get(evt.event_type)
+        if callbacks is None:
+            return
+        if cls.deferred:
+            cls.queue.append(evt)
+            return
+        for callback in callbacks:
+            callback(evt)
+
+    @classmethod
+    def publish_type(cls, tag: ModelEvent.EventType, data=None):
+        callbacks = cls.by_type.get(tag)
+        if callbacks is None:
+            return
+        evt = cls.events.get(tag) if data is None else None
+        if evt is None:
+            evt = ModelEvent(tag, data)
+            if data is None:
+                cls.events[tag] = evt
+        if cls.deferred:
+            cls.queue.append(evt)
+            return
+        for callback in callbacks:
+            callback(evt)
 
     @classmethod
-    def publish_type(cls, tag: ModelEvent.EventType):
-        cls.publish(ModelEvent(tag, None))
+    def drain(cls):
+        """Dispatches the queued events, in order."""
+        if not cls.queue:
+            return
+        queue, cls.queue = cls.queue, []
+        for evt in queue:
+            for callback in cls.by_type.get(evt.event_type, ()):
+                callback(evt)
+
+    # ---------- Helpers ------------------------
+
+    @classmethod
+    def __rebuild(cls):
+        by_type = {}
+        for tag in ModelEvent.EventType:
+            callbacks = [h.on_model_event for h, types in cls.handlers if types is None or tag in types]
+            if cls.trace:
+                # Tracking all events
+                callbacks.insert(0, print)
+            if callbacks:
+                by_type[tag] = callbacks
+        cls.by_type = by_type
+
@@ -7,7 +7,8 @@ from .Entity import Entity
 
 
 class Ball(Entity):
-    
+    __slots__ = ()
+
     def intersects(self, paddle: Entity) -> bool:
         """Determines if the Ball intersects given Entity."""
         above = paddle.get_max_y() < self.get_y()
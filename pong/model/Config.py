@@ -15,3 +15,6 @@ PADDLE_SPEED = 5
 BALL_SPEED_FACTOR = 1.05
 BALL_WIDTH = 20
 BALL_HEIGHT = 20
+
+# Recording config
+NO_DECISION = 255  # Decision recorded for frames in which an AI did not decide
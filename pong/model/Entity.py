@@ -1,8 +1,12 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 
-@dataclass(unsafe_hash=True)
+@dataclass(slots=True, eq=False)
 class Entity:
-    """This class represents an Entity in the game. It has a position, a velocity, and a size."""
+    """
+    This class represents an Entity in the game. It has a position, a velocity, and a size.
+    Entities are slotted and compare (and hash) by identity, they are reset in place
+    rather than recreated. See in_buffer for entities living in a shared float64 buffer.
+    """
     x: int
     y: int
     width: int
@@ -10,12 +14,35 @@ class Entity:
     dx: int = 0
     dy: int = 0
 
-    def move(self):
+    FIELD_COUNT = 6  # Values per entity in a buffer: x, y, width, height, dx, dy
+
+    @classmethod
+    def in_buffer(cls, buffer, offset: int, *args, **kwargs) -> "Entity":
+        """
+        Creates an entity of this class whose fields are stored in buffer[offset:offset + 6],
+        any writable C-contiguous float64 buffer (numpy array, array.array, shared memory).
+        Other processes can then read the entity without any copying or pickling.
+        """
+        view_class = cls.__buffer_class()
+        entity = view_class.__new__(view_class)
+        entity.values = memoryview(buffer).cast("B").cast("d")[offset:offset + cls.FIELD_COUNT]
+        entity.__init__(*args, **kwargs)
+        return entity
+
+    def reset(self, x: int, y: int, dx: int = 0, dy: int = 0):
+        """Puts the entity back at given position and velocity, keeping its size."""
+        self.x = x
+        self.y = y
+        self.dx = dx
+        self.dy = dy
+
+    def move(self, dt: float = 1):
         """
-        This method increments the x and y coordinates of the Entity by the dx and dy values.
+        This method increments the x and y coordinates of the Entity by the dx and dy values,
+        scaled by the timestep dt (in frames).
         """
-        self.x += self.dx
-        self.y += self.dy
+        self.x += self.dx * dt
+        self.y += self.dy * dt
 
     def get_x(self) -> int:
         """Returns the x-coordinate of the Entity."""
@@ -50,4 +77,23 @@ class Entity:
         The accelerate method increments the dx and dy values of the Entity by the values passed in.
         """
         self.dx = dx
-        self.dy = dy
\ No newline at end of file
+        self.dy = dy
+
+    # ---------- Helpers ------------------------
+
+    @classmethod
+    def __buffer_class(cls) -> type:
+        """Returns the subclass of this class storing its fields in a buffer, created once."""
+        view_class = cls.__dict__.get("_buffer_class")
+        if view_class is None:
+            def field(index: int) -> property:
+                return property(
+                    lambda self: self.values[index],
+                    lambda self, value: self.values.__setitem__(index, value)
+                )
+            namespace = {"__slots__": ("values",), "__qualname__": cls.__qualname__}
+            for index, f in enumerate(fields(cls)):
+                namespace[f.name] = field(index)
+            view_class = type(cls.__name__, (cls,), namespace)
+            setattr(cls, "_buffer_class", view_class)
+        return view_class
\ No newline at end of file
@@ -0,0 +1,206 @@
+# package pong.model
+import os
+import struct
+import numpy as np
+from pong.model.Config import NO_DECISION
+
+class MatchRecorder:
+    """
+    Records matches frame by frame into a compact binary file, replayed by ReplayViewer.
+
+    A recording is a header (magic, version, record size) followed by fixed-width records
+    (RECORD): ball and paddles after every update, the decisions of both AIs and the
+    events of that frame. Being fixed-width, any frame is one seek away and reading just
+    memory-maps the file (see read). The sidecar index (path + ".idx", same header,
+    INDEX records) lists where every match and rally starts.
+
+    Records are packed into a buffer, written a chunk at a time and at the end of every
+    match. Both files are only ever appended to, so a recording can be replayed while
+    training is still writing it, and a run interrupted mid-write loses just its last chunk.
+    """
+    MAGIC = b"PONGREC\0"
+    INDEX_MAGIC = b"PONGIDX\0"
+    VERSION = 1
+    HEADER = struct.Struct("<8sHHI")  # magic, version, record size, reserved
+    CHUNK = 4096                       # Records buffered before writing
+
+    RECORD = np.dtype([
+        ("match", "<u4"),     # Match id given to begin_match
+        ("frame", "<u4"),     # Frames simulated since the match started
+        ("ball_x", "<f4"), ("ball_y", "<f4"), ("ball_dx", "<f4"), ("ball_dy", "<f4"),
+        ("left_y", "<f4"), ("left_dy", "<f4"), ("right_y", "<f4"), ("right_dy", "<f4"),
+        ("points_left", "u1"), ("points_right", "u1"), ("left_hits", "<u2"), ("right_hits", "<u2"),
+        ("decision_left", "u1"), ("decision_right", "u1"),  # 0 keep, 1 up, 2 down, NO_DECISION
+        ("events", "u1"),     # PADDLE_HIT | WALL_HIT | POINT
+    ])
+    INDEX = np.dtype([("record", "<u8"), ("match", "<u4"), ("kind", "u1")])
+    PACK = struct.Struct("<II8fBBHHBBB")
+    INDEX_PACK = struct.Struct("<QIB")
+
+    NO_DECISION = NO_DECISION
+    # Event bits
+    PADDLE_HIT = 1
+    WALL_HIT   = 2
+    POINT      = 4
+    # Index kinds
+    MATCH_START = 0
+    RALLY_START = 1
+
+    def __init__(self, path: str, chunk: int = CHUNK):
+        self.path = path
+        self.chunk = chunk
+        self.file = self.__open(path, self.MAGIC, self.RECORD)
+        self.index_file = self.__open(path + ".idx", self.INDEX_MAGIC, self.INDEX)
+        self.records = (self.file.tell() - self.HEADER.size) // self.RECORD.itemsize
+        self.buffer = bytearray(chunk * self.PACK.size)
+        self.buffered = 0
+        self.index_buffer = bytearray()
+        # Current match
+        self.match_id = 0
+        self.frame = 0
+        self.points = 0
+        self.hits = 0
+        self.ball_down = False
+
+    def begin_match(self, match, match_id: int):
+        """Starts recording a (freshly loaded) match, its first record is the serve."""
+        self.match_id = match_id
+        self.frame = 0
+        self.__index(self.MATCH_START)
+        self.__track(match)
+        self.__pack(match, self.NO_DECISION, self.NO_DECISION, 0)
+
+    def record(self, match, decision_left: int = NO_DECISION, decision_right: int = NO_DECISION,
+               frames: int = 1):
+        """Records the match after an update (or advance by frames) with the decisions taken before it."""
+        # Inlined __track and __pack, this runs every frame
+        self.frame += frames
+        ball, left, right = match.ball, match.left_paddle, match.right_paddle
+        points_left, points_right = match.points_left, match.points_right
+        left_hits, right_hits = match.left_hits, match.right_hits
+        ball_down = ball.dy > 0
+        events = 0
+        if points_left + points_right != self.points:
+            # A new ball has been served
+            events = self.POINT
+            self.points = points_left + points_right
+            self.__index(self.RALLY_START)
+        elif left_hits + right_hits != self.hits:
+            events = self.PADDLE_HIT
+        elif ball_down != self.ball_down:
+            events = self.WALL_HIT
+        self.hits = left_hits + right_hits
+        self.ball_down = ball_down
+
+        self.PACK.pack_into(
+            self.buffer, self.buffered * self.PACK.size,
+            self.match_id, self.frame, ball.x, ball.y, ball.dx, ball.dy, left.y, left.dy, right.y, right.dy,
+            points_left, points_right, left_hits, right_hits, decision_left, decision_right, events,
+        )
+        self.buffered += 1
+        self.records += 1
+        if self.buffered == self.chunk:
+            self.flush()
+
+    def end_match(self):
+        """Writes out the match, so every finished match is on disk."""
+        self.flush()
+
+    def flush(self):
+        """Appends the buffered records, then their index entries."""
+        if self.buffered:
+            self.file.write(memoryview(self.buffer)[:self.buffered * self.PACK.size])
+            self.file.flush()
+            self.buffered = 0
+        if self.index_buffer:
+            self.index_file.write(self.index_buffer)
+            self.index_file.flush()
+            self.index_buffer = bytearray()
+
+    def close(self):
+        if self.file is None:
+            return
+        self.flush()
+        self.file.close()
+        self.index_file.close()
+        self.file = self.index_file = None
+
+    # -------------- Reading -----------------------------
+
+    @classmethod
+    def read(cls, path: str) -> np.ndarray:
+        """Memory-maps the records of a recording (complete ones, it may still be written)."""
+        return cls.__map(path, cls.MAGIC, cls.RECORD)
+
+    @classmethod
+    def read_index(cls, path: str) -> np.ndarray:
+        """Returns the match and rally starts of a recording, rebuilt from the records if the index is missing."""
+        index_path = path + ".idx"
+        if os.path.exists(index_path):
+            return cls.__map(index_path, cls.INDEX_MAGIC, cls.INDEX)
+        records = cls.read(path)
+        starts = np.flatnonzero((records["frame"] == 0) | (records["events"] & cls.POINT != 0))
+        index = np.zeros(len(starts), dtype=cls.INDEX)
+        index["record"] = starts
+        index["match"] = records["match"][starts]
+        index["kind"] = np.where(records["frame"][starts] == 0, cls.MATCH_START, cls.RALLY_START)
+        return index
+
+    # ---------- Helpers ------------------------
+
+    def __track(self, match):
+        """Remembers what record compares against to find the events of the next frame."""
+        self.points = match.points_left + match.points_right
+        self.hits = match.left_hits + match.right_hits
+        self.ball_down = match.ball.dy > 0
+
+    def __pack(self, match, decision_left: int, decision_right: int, events: int):
+        ball, left, right = match.ball, match.left_paddle, match.right_paddle
+        self.PACK.pack_into(
+            self.buffer, self.buffered * self.PACK.size,
+            self.match_id, self.frame, ball.x, ball.y, ball.dx, ball.dy, left.y, left.dy, right.y, right.dy,
+            match.points_left, match.points_right, match.left_hits, match.right_hits,
+            decision_left, decision_right, events,
+        )
+        self.buffered += 1
+        self.records += 1
+        if self.buffered == self.chunk:
+            self.flush()
+
+    def __index(self, kind: int):
+        """Adds an index entry for the next record."""
+        self.index_buffer += self.INDEX_PACK.pack(self.records, self.match_id, kind)
+
+    @classmethod
+    def __open(cls, path: str, magic: bytes, dtype: np.dtype):
+        """Opens a file for appending, writing its header if new and cutting off a partly written record."""
+        file = open(path, "ab")
+        if file.tell() == 0:
+            file.write(cls.HEADER.pack(magic, cls.VERSION, dtype.itemsize, 0))
+            return file
+        cls.__check_header(path, magic, dtype)
+        end = cls.HEADER.size + (file.tell() - cls.HEADER.size) // dtype.itemsize * dtype.itemsize
+        if end != file.tell():
+            file.truncate(end)
+            file.seek(end)
+        return file
+
+    @classmethod
+    def __map(cls, path: str, magic: bytes, dtype: np.dtype) -> np.ndarray:
+        cls.__check_header(path, magic, dtype)
+        count = (os.path.getsize(path) - cls.HEADER.size) // dtype.itemsize
+        if count == 0:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode="r", offset=cls.HEADER.size, shape=(count,))
+
+    @classmethod
+    def __check_header(cls, path: str, expected: bytes, dtype: np.dtype):
+        with open(path, "rb") as file:
+            header = file.read(cls.HEADER.size)
+        if len(header) < cls.HEADER.size:
+            raise ValueError(f"Not a match recording: {path}")
+        magic, version, record_size, _ = cls.HEADER.unpack(header)
+        if magic != expected:
+            raise ValueError(f"Not a match recording: {path}")
+        if version != cls.VERSION or record_size != dtype.itemsize:
+            raise ValueError(f"Unsupported recording version {version} in {path}")
@@ -2,7 +2,9 @@ from pong.model.Config import GAME_HEIGHT, PADDLE_HEIGHT
 from .Entity import Entity
 
 class Paddle(Entity):
-    def move(self):
+    __slots__ = ()
+
+    def move(self, dt: float = 1):
         # Assert within game border
         if self.dy > 0:
             if self.y >= GAME_HEIGHT - PADDLE_HEIGHT:
@@ -11,5 +13,7 @@ class Paddle(Entity):
             if self.y <= 0:
                 self.dy = 0
 
-        self.x += self.dx
-        self.y += self.dy
+        super().move(dt)
+        # Timesteps and partial moves (swept collisions) may overshoot the border. At dt=1 this
+        # never applies in play: paddles start and move on multiples of PADDLE_SPEED
+        self.y = min(max(self.y, 0), GAME_HEIGHT - PADDLE_HEIGHT)
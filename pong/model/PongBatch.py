@@ -0,0 +1,169 @@
+# package pong.model
+import numpy as np
+from pong.model.Config import *
+
+class PongBatch:
+    """
+     * Vectorized Pong engine stepping N matches at once
+     * Struct of arrays: one NumPy array per property, one row per match
+     * Same rules as PongMatch, but no Entity objects and no events
+
+     Actions per paddle follow the AI decisions: 0 keep moving, 1 up, 2 down.
+     Paddle columns are 0 = left, 1 = right.
+    """
+    # Actions
+    KEEP = 0
+    UP   = 1
+    DOWN = 2
+
+    # Codes for last_hit (see PongMatch.last_hit)
+    NO_HIT       = 0
+    TOP_WALL     = 1
+    BOTTOM_WALL  = 2
+    LEFT_PADDLE  = 3
+    RIGHT_PADDLE = 4
+
+    PADDLE_X = np.array([0, GAME_WIDTH - PADDLE_WIDTH], dtype=np.float64)
+
+    def __init__(self, n: int, seed: int = None, jitter: float = 0.1):
+        self.n = n
+        self.rng = np.random.default_rng(seed)
+        # Random spread added to the ball vector on paddle hits
+        self.jitter = jitter
+
+        self.ball_x  = np.zeros(n)
+        self.ball_y  = np.zeros(n)
+        self.ball_dx = np.zeros(n)
+        self.ball_dy = np.zeros(n)
+        self.paddle_y  = np.zeros((n, 2))
+        self.paddle_dy = np.zeros((n, 2))
+        self.points   = np.zeros((n, 2), dtype=np.int64)
+        self.hits     = np.zeros((n, 2), dtype=np.int64)
+        self.last_hit = np.zeros(n, dtype=np.int8)
+        self.reset()
+
+    # --------  Game Logic -------------
+
+    def reset(self, mask: np.ndarray = None):
+        """Starts new matches (all, or where mask is True): resets points, hits and entities."""
+        mask = self.__all() if mask is None else mask
+        self.points[mask] = 0
+        self.hits[mask] = 0
+        self.last_hit[mask] = self.NO_HIT
+        self.load_entities(mask)
+
+    def load_entities(self, mask: np.ndarray):
+        """Puts paddles and ball back at their start positions where mask is True."""
+        count = int(np.count_nonzero(mask))
+        self.paddle_y[mask] = GAME_HEIGHT / 2 - PADDLE_HEIGHT / 2
+        self.paddle_dy[mask] = 0
+        self.ball_x[mask] = GAME_WIDTH / 2 - BALL_WIDTH / 2
+        self.ball_y[mask] = GAME_HEIGHT / 2 - BALL_HEIGHT / 2
+        self.ball_dx[mask] = self.rng.choice([-4.0, 4.0], size=count)
+        self.ball_dy[mask] = self.rng.choice([-1.0, 1.0], size=count)
+
+    def step(self, actions: np.ndarray, active: np.ndarray = None) -> np.ndarray:
+        """
+        Advances all matches (or those where active is True) by one frame.
+        actions is an (n, 2) array of paddle actions.
+        Returns an int8 array with the side that scored in this frame: 0 none, 1 left, 2 right.
+        """
+        active = self.__all() if active is None else active
+        self.__steer(actions, active)
+        self.__move(active)
+        self.__bounce_wall(active)
+        self.__bounce_paddle(active, 1)
+        self.__bounce_paddle(active, 0)
+        return self.__touch_down(active)
+
+    def get_winner(self) -> np.ndarray:
+        """Returns the winner per match: 0 none, 1 left, 2 right."""
+        winner = np.zeros(self.n, dtype=np.int8)
+        winner[self.points[:, 1] >= MAX_POINTS] = 2
+        winner[self.points[:, 0] >= MAX_POINTS] = 1
+        return winner
+
+    # ------- Helpers --------------------------------------
+
+    def __all(self) -> np.ndarray:
+        return np.ones(self.n, dtype=bool)
+
+    def __steer(self, actions: np.ndarray, active: np.ndarray):
+        """Applies the paddle actions, like PongGUI.move_paddle."""
+        actions = np.where(active[:, None], actions, self.KEEP)
+        self.paddle_dy[actions == self.UP] = -PADDLE_SPEED
+        self.paddle_dy[actions == self.DOWN] = PADDLE_SPEED
+
+    def __move(self, active: np.ndarray):
+        """Moves paddles (stopping at the borders, like Paddle.move) and the ball."""
+        stop = np.where(
+            self.paddle_dy > 0,
+            self.paddle_y >= GAME_HEIGHT - PADDLE_HEIGHT,
+            self.paddle_y <= 0,
+        )
+        self.paddle_dy[stop & active[:, None]] = 0
+        self.paddle_y += np.where(active[:, None], self.paddle_dy, 0)
+        self.ball_x += np.where(active, self.ball_dx, 0)
+        self.ball_y += np.where(active, self.ball_dy, 0)
+
+    def __bounce_wall(self, active: np.ndarray):
+        """If the ball hits the top or bottom of the screen, reverse its vertical direction."""
+        top = self.ball_y <= 0
+        wall = active & ((self.ball_y + BALL_HEIGHT >= GAME_HEIGHT) | top)
+        self.ball_dy[wall] *= -1
+        self.last_hit[wall] = np.where(top[wall], self.TOP_WALL, self.BOTTOM_WALL)
+
+    def __bounce_paddle(self, active: np.ndarray, side: int):
+        """Bounces the ball off the paddle on given side, see PongMatch.__compute_new_vector."""
+        paddle_x = self.PADDLE_X[side]
+        paddle_y = self.paddle_y[:, side]
+        # Ball.intersects
+        hit = active & ~(
+            (paddle_y + PADDLE_HEIGHT < self.ball_y)
+            | (paddle_y > self.ball_y + BALL_HEIGHT)
+            | (paddle_x + PADDLE_WIDTH < self.ball_x)
+            | (paddle_x > self.ball_x + BALL_WIDTH)
+        )
+        if not hit.any():
+            return
+
+        code = self.RIGHT_PADDLE if side == 1 else self.LEFT_PADDLE
+        self.hits[hit & (self.last_hit != code), side] += 1
+        self.last_hit[hit] = code
+
+        ball_x = self.ball_x[hit]
+        dx = self.ball_dx[hit]
+        dy = self.ball_dy[hit]
+        total_speed = np.sqrt(dx**2 + dy**2)
+        hit_distance = (paddle_y[hit] + PADDLE_HEIGHT / 2) - (self.ball_y[hit] + BALL_HEIGHT / 2)
+        angle = np.radians(hit_distance / (PADDLE_HEIGHT / 2) * 40)
+
+        new_dx = total_speed * np.cos(angle)
+        new_dy = np.abs(total_speed * np.sin(angle))
+        if side == 1:
+            new_dx = -np.abs(new_dx)
+            new_dy = -new_dy
+
+        new_dy[hit_distance <= 0] *= -1
+        new_dy[ball_x <= GAME_WIDTH / 2] *= -1
+        new_dy[new_dy == 0] = 0.05
+        count = len(ball_x)
+        new_dy += self.rng.uniform(-self.jitter, self.jitter, size=count)
+        new_dx += self.rng.uniform(-self.jitter, self.jitter, size=count)
+
+        self.ball_dx[hit] = BALL_SPEED_FACTOR * new_dx
+        self.ball_dy[hit] = new_dy
+
+    def __touch_down(self, active: np.ndarray) -> np.ndarray:
+        """Scores points for balls touching the left or right wall and resets those matches."""
+        center_x = self.ball_x + BALL_WIDTH / 2
+        scored = np.zeros(self.n, dtype=np.int8)
+        scored[active & (center_x >= GAME_WIDTH)] = 1
+        scored[active & (center_x <= 0)] = 2
+        point = scored != 0
+        if point.any():
+            self.points[scored == 1, 0] += 1
+            self.points[scored == 2, 1] += 1
+            self.hits[point] = 0
+            self.load_entities(point)
+        return scored
@@ -0,0 +1,397 @@
+# package pong.model
+from math import *
+from typing import List, Optional, Tuple
+import random
+from pong.event.EventBus import EventBus
+from pong.event.ModelEvent import ModelEvent
+from pong.model.Ball import Ball
+from pong.model.Config import *
+from pong.model.Entity import Entity
+from pong.model.Paddle import Paddle
+
+class PongMatch:
+    """
+     * Logic for one Pong match
+     * All game state lives on the instance, so any number of
+       matches can run side by side in one process
+     * Nothing visual here, see Pong for the default match used by the GUI
+    """
+    entities: List[Entity]
+
+    # Max collisions resolved within one swept update
+    MAX_SWEPT_EVENTS = 16
+
+    def __init__(self, rng: random.Random = None, timestep: float = 1, swept: bool = False,
+                 state=None):
+        # Source of randomness for ball direction and bounce jitter,
+        # pass a seeded random.Random to make a match reproducible
+        self.rng = rng if rng is not None else random
+        # Frames simulated per update(). Any timestep but 1 (or swept=True) uses swept
+        # collision detection, finding the exact time of impact within the step
+        self.timestep = timestep
+        self.swept = swept or timestep != 1
+        # Optional writable float64 buffer of 3 * Entity.FIELD_COUNT values the entities
+        # live in (left paddle, right paddle, ball), e.g. shared memory read by another process
+        self.state = state
+        self.points_left  = 0
+        self.points_right = 0
+        self.left_hits    = 0
+        self.right_hits   = 0
+        self.last_hit: str = ""
+        self.entities = None
+
+    # --------  Game Logic -------------
+
+    def load_entities(self):
+        """Loads all entities of the game, resetting them in place once created."""
+        right_border_x = GAME_WIDTH - PADDLE_WIDTH
+        side_border_y = GAME_HEIGHT / 2 - PADDLE_HEIGHT / 2
+        ball_dx, ball_dy = self.__serve()
+        ball_x = GAME_WIDTH / 2 - BALL_WIDTH / 2
+        ball_y = GAME_HEIGHT / 2 - BALL_HEIGHT / 2
+        if self.entities is not None:
+            self.left_paddle.reset(0, side_border_y)
+            self.right_paddle.reset(right_border_x, side_border_y)
+            self.ball.reset(ball_x, ball_y, ball_dx, ball_dy)
+            return
+
+        # Initialise entities
+        self.left_paddle = self.__create(Paddle, 0, 0, side_border_y, PADDLE_WIDTH, PADDLE_HEIGHT)
+        self.right_paddle = self.__create(Paddle, 1, right_border_x, side_border_y, PADDLE_WIDTH, PADDLE_HEIGHT)
+        self.ball = self.__create(Ball, 2, ball_x, ball_y, BALL_WIDTH, BALL_HEIGHT, ball_dx, ball_dy)
+        self.entities = [
+            self.left_paddle,
+            self.right_paddle,
+            self.ball
+        ]
+
+    def update(self):
+        """Updates the state of all loaded Entities."""
+        if self.swept:
+            self.__update_swept()
+            return
+
+        for entity in self.entities:
+            entity.move()
+
+        self.check_collisions()
+
+    def advance(self, frames: int) -> int:
+        """
+        Advances the match by up to given number of frames, with the same outcome as calling
+        update() that often. Stretches where the ball cannot reach a paddle column are jumped
+        in closed form, wall bounces included, only frames close to a paddle are stepped one by one.
+        Returns early, right after the frame in which a paddle hit or a point happened,
+        so the controllers can react. Returns the number of frames advanced.
+        Swept matches are stepped one update() at a time.
+        """
+        advanced = 0
+        while advanced < frames:
+            skip = 0 if self.swept else min(self.__frames_without_event(), frames - advanced)
+            if skip > 0:
+                self.__skip(skip)
+                advanced += skip
+                continue
+
+            before = (self.left_hits, self.right_hits, self.points_left, self.points_right)
+            self.update()
+            advanced += 1
+            if before != (self.left_hits, self.right_hits, self.points_left, self.points_right):
+                break
+        return advanced
+
+    def get_points_left(self) -> int:
+        """Returns the points of the left Paddle."""
+        return self.points_left
+
+    def get_points_right(self) -> int:
+        """Returns the points of the right Paddle."""
+        return self.points_right
+
+    def get_hits(self) -> Tuple[int, int]:
+        """ Returns the number of hits of both paddles."""
+        return self.left_hits, self.right_hits
+
+    def check_collisions(self):
+        """Checks for collisions."""
+        # Collision with top and bottom wall
+        if self.last_hit != "top_wall" or self.last_hit != "bottom_wall":
+            self.__bounce_wall()
+        # Collisions between ball & paddle
+        if self.last_hit != "left_paddle" or self.last_hit != "right_paddle":
+            self.__bounce_paddle()
+
+        # Collision with side wall, point scoring
+        self.__touch_down()
+
+    def reset_points(self):
+        """Resets the game points."""
+        self.points_left = 0
+        self.points_right = 0
+        self.reset_hits()
+
+    def reset_hits(self):
+        """ Resets the hits of both paddles."""
+        self.left_hits = 0
+        self.right_hits = 0
+
+    def get_winner(self) -> Optional[int]:
+        """Returns the winner, if any."""
+        if self.points_left >= MAX_POINTS:
+            return 1
+        elif self.points_right >= MAX_POINTS:
+            return 2
+        else:
+            return None
+
+    def change_last_hit(self, item: str):
+        """Changes the time of the last hit."""
+        self.last_hit = item
+
+    # ------- Helpers --------------------------------------
+
+    def __update_swept(self):
+        """
+        Moves everything by one timestep, resolving collisions at their exact time of impact,
+        so the ball cannot tunnel through a paddle however large the step.
+        """
+        remaining = self.timestep
+        for _ in range(self.MAX_SWEPT_EVENTS):
+            impact, event = self.__next_impact(remaining)
+            if event is None:
+                break
+            for entity in self.entities:
+                entity.move(impact)
+            remaining -= impact
+
+            if event == "top_wall" or event == "bottom_wall":
+                self.ball.accelerate(self.ball.dx, -self.ball.dy)
+                self.last_hit = event
+            elif event == "touch_down":
+                # The new ball starts right away, keeping the timeline independent of the step size
+                self.__point_won("r" if self.ball.dx < 0 else "l")
+            else:
+                self.__hit_paddle(event)
+
+        for entity in self.entities:
+            entity.move(remaining)
+
+    def __next_impact(self, dt: float) -> Tuple[float, Optional[object]]:
+        """
+        Returns the time of the first collision within dt and what is hit:
+        a wall name, a paddle or "touch_down" (None if nothing is hit).
+        """
+        ball = self.ball
+        first, event = inf, None
+        # Top and bottom wall, only when moving towards them
+        if ball.dy < 0:
+            first, event = ball.get_y() / -ball.dy, "top_wall"
+        elif ball.dy > 0:
+            first, event = (GAME_HEIGHT - ball.get_max_y()) / ball.dy, "bottom_wall"
+
+        # Paddles, swept AABB with the ball moving relative to the paddle
+        for paddle in [self.right_paddle, self.left_paddle]:
+            towards = ball.dx > 0 if paddle is self.right_paddle else ball.dx < 0
+            if not towards:
+                continue
+            impact = self.__paddle_impact(paddle, dt)
+            if impact < first:
+                first, event = impact, paddle
+
+        # Side walls, the ball center crossing them scores
+        if ball.dx < 0:
+            touch_down = -ball.get_center_x() / ball.dx
+        else:
+            touch_down = (GAME_WIDTH - ball.get_center_x()) / ball.dx if ball.dx > 0 else inf
+        if touch_down < first:
+            first, event = max(touch_down, 0), "touch_down"
+
+        if first > dt:
+            return dt, None
+        return max(first, 0), event
+
+    def __paddle_impact(self, paddle: Paddle, dt: float) -> float:
+        """
+        Returns the time at which the ball starts touching given paddle within dt (inf if it does not).
+        A paddle moves until it reaches the border and stays there (see Paddle.move), so the
+        sweep is solved for the paddle moving, then for the paddle stopped at the border.
+        """
+        ball = self.ball
+        if paddle.dy > 0:
+            stop = max((GAME_HEIGHT - PADDLE_HEIGHT - paddle.y) / paddle.dy, 0)
+        elif paddle.dy < 0:
+            stop = max(paddle.y / -paddle.dy, 0)
+        else:
+            stop = inf
+        phases = [(0, min(stop, dt), paddle.dy)]
+        if stop < dt:
+            phases.append((stop, dt, 0))
+        for start, end, paddle_dy in phases:
+            entry_x, leave_x = self.__sweep(ball.get_x() + start * ball.dx, ball.width, ball.dx,
+                                            paddle.get_x(), paddle.width)
+            entry_y, leave_y = self.__sweep(ball.get_y() + start * ball.dy, ball.height, ball.dy - paddle_dy,
+                                            paddle.get_y() + min(start, stop) * paddle.dy, paddle.height)
+            entry, leave = max(entry_x, entry_y), min(leave_x, leave_y)
+            if entry <= leave and leave >= 0 and start + max(entry, 0) <= end:
+                return start + max(entry, 0)
+        return inf
+
+    @staticmethod
+    def __sweep(position: float, size: float, velocity: float, other: float, other_size: float) -> Tuple[float, float]:
+        """Returns the times at which two intervals on one axis start and stop overlapping."""
+        if velocity > 0:
+            return (other - (position + size)) / velocity, (other + other_size - position) / velocity
+        elif velocity < 0:
+            return (other + other_size - position) / velocity, (other - (position + size)) / velocity
+        elif position <= other + other_size and other <= position + size:
+            return -inf, inf
+        return inf, -inf
+
+    def __frames_without_event(self) -> int:
+        """
+        Returns how many frames can pass for sure without the ball entering a paddle column
+        or scoring (one frame of margin for rounding). Wall bounces are left to __skip.
+        """
+        ball = self.ball
+        # Still inside a wall or paddle zone after the next move (e.g. right after a bounce),
+        # a ball deep inside a wall may bounce off it frame after frame
+        next_x = ball.get_x() + ball.dx
+        next_y = ball.get_y() + ball.dy
+        if (next_x <= PADDLE_WIDTH or next_x + ball.width >= GAME_WIDTH - PADDLE_WIDTH
+                or next_y <= 0 or next_y + ball.height >= GAME_HEIGHT):
+            return 0
+
+        # Paddle columns, a touchdown always passes through one first
+        if ball.dx < 0:
+            frames = ceil((ball.get_x() - PADDLE_WIDTH) / -ball.dx)
+        elif ball.dx > 0:
+            frames = ceil((GAME_WIDTH - PADDLE_WIDTH - ball.get_max_x()) / ball.dx)
+        else:
+            return 0
+        return max(0, frames - 2)
+
+    def __skip(self, frames: int):
+        """Moves all entities by given number of frames without paddle hits or points at once."""
+        for paddle in (self.left_paddle, self.right_paddle):
+            # Paddle.move clamps a paddle to the border, and stops it on the move after
+            if paddle.dy > 0:
+                moves = ceil((GAME_HEIGHT - PADDLE_HEIGHT - paddle.y) / paddle.dy)
+            elif paddle.dy < 0:
+                moves = ceil(paddle.y / -paddle.dy)
+            else:
+                moves = frames
+            moves = max(0, moves)
+            paddle.y = min(max(paddle.y + min(frames, moves) * paddle.dy, 0), GAME_HEIGHT - PADDLE_HEIGHT)
+            if frames > moves:
+                paddle.dy = 0
+
+        ball = self.ball
+        ball.x += frames * ball.dx
+        # Straight to every wall bounce: update() reverses dy once the ball overlaps a wall after a move
+        y, dy = ball.y, ball.dy
+        while dy != 0:
+            if dy < 0:
+                to_wall = max(1, ceil(y / -dy))
+            else:
+                to_wall = max(1, ceil((GAME_HEIGHT - ball.height - y) / dy))
+            if to_wall > frames:
+                break
+            y += to_wall * dy
+            frames -= to_wall
+            self.last_hit = "top_wall" if dy < 0 else "bottom_wall"
+            dy = -dy
+        ball.y = y + frames * dy
+        ball.dy = dy
+
+    def __touch_down(self):
+        """
+        If the ball touches the left or right wall, the points are updated and the ball is reset.
+        """
+        if (self.ball.get_center_x() <= 0):
+            self.__point_won("r")
+        elif (self.ball.get_center_x() >= GAME_WIDTH):
+            self.__point_won("l")
+
+    def __point_won(self, side: str):
+        """Adds a point to the player on the given side, and resets the ball."""
+        if side == "r":
+            self.points_right += 1
+        elif side == "l":
+            self.points_left += 1
+
+        self.reset_hits()
+        self.load_entities()
+
+    def __bounce_wall(self):
+        """If the ball hits the top or bottom of the screen, reverse its vertical direction."""
+        if (self.ball.get_max_y() >= GAME_HEIGHT or self.ball.get_y() <= 0):
+            self.ball.accelerate(self.ball.dx, -self.ball.dy)
+            self.last_hit = "top_wall" if self.ball.get_y() <= 0 else "bottom_wall"
+
+    def __bounce_paddle(self):
+        """If the ball hits the paddle, bounce it back at a different angle depending on where it hits the paddle."""
+        for paddle in [self.right_paddle, self.left_paddle]:
+            if self.ball.intersects(paddle):
+                self.__hit_paddle(paddle)
+
+    def __hit_paddle(self, paddle: Paddle):
+        """Counts the hit and bounces the ball off given paddle."""
+        if paddle == self.right_paddle:
+            self.right_hits += 1 if self.last_hit != "right_paddle" else 0
+            self.change_last_hit("right_paddle")
+        else:
+            self.left_hits += 1 if self.last_hit != "left_paddle" else 0
+            self.change_last_hit("left_paddle")
+
+        new_dx, new_dy = self.__compute_new_vector(paddle)
+        self.ball.accelerate((BALL_SPEED_FACTOR * new_dx), new_dy)
+        EventBus.publish_type(ModelEvent.EventType.BALL_HIT_PADDLE)
+
+    def __serve(self) -> Tuple[int, int]:
+        """Returns the starting direction of the ball, diffrent each round."""
+        random_dx = self.rng.choice([-4, 4])
+        random_dy = self.rng.choice([-1, 1])
+        return random_dx, random_dy
+
+    def __create(self, entity_class: type, index: int, *args) -> Entity:
+        """Creates the entity, in its slice of the state buffer if there is one."""
+        if self.state is None:
+            return entity_class(*args)
+        return entity_class.in_buffer(self.state, index * Entity.FIELD_COUNT, *args)
+
+    def __compute_new_vector(self, paddle: Entity) -> Tuple[float, float]:
+        """Calculates required speed of respective vector for new angle while keeping total speed constant."""
+        total_speed = sqrt(self.ball.dx**2 + self.ball.dy**2)
+        new_angle = self.__calc_new_angle(paddle)
+
+        new_dx = total_speed * cos(new_angle[0])
+        new_dy = total_speed * sin(new_angle[0])
+
+        if paddle == self.left_paddle:
+        # Convert general formula to depend on which paddle side new_dx = new_dx * (-1 if new_dx <= 0 else 1)
+            new_dy = new_dy * (-1 if new_dy <= 0 else 1)
+        else:
+            new_dx = new_dx * (-1 if new_dx >= 0 else 1)
+            new_dy = new_dy * (-1 if new_dy >= 0 else 1)
+
+        # Ensure the ball's direction is correct when the ball hits different halves of the paddle
+        if new_angle[1] <= 0:
+           new_dy *= -1
+
+        if self.ball.get_x() <= GAME_WIDTH / 2:
+            new_dy *= -1
+
+        if abs(new_dy) == 0:
+            new_dy = 0.05
+        new_dy += self.rng.uniform(-0.1, 0.1)
+        new_dx += self.rng.uniform(-0.1, 0.1)
+        return new_dx, new_dy
+
+    def __calc_new_angle(self, paddle: Entity) -> Tuple[float, float]:
+        """Calculates the new angle of the ball after hitting the paddle."""
+        paddle_center_y = paddle.get_y() + paddle.height / 2
+        ball_center_y = self.ball.get_y() + self.ball.height / 2
+        hit_distance = paddle_center_y - ball_center_y
+
+        angle = hit_distance / (paddle.height / 2) * 40
+        return [radians(angle), hit_distance]
@@ -0,0 +1,274 @@
+# package pong.perf
+from time import perf_counter
+from typing import Callable, Dict, Tuple
+import json
+import os
+import pickle
+import platform
+import random
+import subprocess
+import sys
+import time
+
+# Rendering benchmarks draw offscreen, no window needed
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+Result = Tuple[float, str, bool]  # value, unit, higher is better
+
+class Benchmark:
+    """
+    Reproducible benchmarks for physics, inference, rendering and training.
+
+    Every benchmark uses fixed seeds, runs a fixed amount of work REPEATS times
+    and reports the best run. Results are written as JSON and can be compared
+    against a stored baseline (see compare), flagging changes beyond TOLERANCE.
+    Timings depend on the machine, so store a baseline per machine (run.py bench --save-baseline).
+    """
+    REPEATS = 3
+    TOLERANCE = 0.10  # Relative change reported as a regression
+    SEED = 42
+    BASELINE = os.path.join(os.path.dirname(os.path.realpath(__file__)), "baseline.json")
+
+    # Amount of work per run
+    PHYSICS_FRAMES = 50_000
+    BATCH_MATCHES = 256
+    BATCH_FRAMES = 500
+    DECISIONS = 50_000
+    RENDER_FRAMES = 500
+    OFFSCREEN_FRAMES = 20
+    OFFSCREEN_SIZE = (84, 84)
+    POPULATION = 16
+
+    @classmethod
+    def benchmarks(cls) -> Dict[str, Callable[[], Result]]:
+        return {
+            "physics_steps_per_sec": cls.physics,
+            "batch_match_frames_per_sec": cls.batch_physics,
+            "env_transitions_per_sec": cls.env,
+            "decisions_per_sec": cls.decisions,
+            "policy_decisions_per_sec": cls.policy_decisions,
+            "render_fps": cls.render,
+            "offscreen_frames_per_sec": cls.offscreen,
+            "matches_per_sec": cls.matches,
+            "sec_per_generation": cls.generation,
+            "sec_per_generation_batched": cls.generation_batched,
+            "import_ms_headless_train": lambda: cls.import_time("pong.AI.Trainer"),
+            "import_ms_play": lambda: cls.import_time("pong.view.PongGUI"),
+        }
+
+    @classmethod
+    def run(cls, names=None, quick: bool = False) -> dict:
+        """Runs the benchmarks (all if names is None), returns the results with some context."""
+        repeats = 1 if quick else cls.REPEATS
+        results = {}
+        for name, benchmark in cls.benchmarks().items():
+            if names and name not in names:
+                continue
+            runs = [benchmark() for _ in range(repeats)]
+            value, unit, higher_is_better = (max if runs[0][2] else min)(runs, key=lambda run: run[0])
+            results[name] = {"value": value, "unit": unit, "higher_is_better": higher_is_better}
+            print(f"{name:<28} {value:14.2f} {unit}")
+        return {
+            "time": time.time(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "results": results,
+        }
+
+    @classmethod
+    def compare(cls, report: dict, baseline: dict) -> Dict[str, float]:
+        """Prints the change of every result against the baseline, returns the regressions (name -> change)."""
+        regressions = {}
+        for name, result in report["results"].items():
+            base = baseline.get("results", {}).get(name)
+            if base is None or not base["value"]:
+                continue
+            change = result["value"] / base["value"] - 1
+            worse = -change if result["higher_is_better"] else change
+            verdict = "REGRESSION" if worse > cls.TOLERANCE else ("better" if -worse > cls.TOLERANCE else "")
+            print(f"{name:<28} {base['value']:14.2f} -> {result['value']:14.2f} {change:+7.1%} {verdict}")
+            if worse > cls.TOLERANCE:
+                regressions[name] = change
+        return regressions
+
+    @classmethod
+    def save(cls, report: dict, path: str):
+        with open(path, "w") as output:
+            json.dump(report, output, indent=2)
+
+    @classmethod
+    def load(cls, path: str) -> dict:
+        with open(path) as file:
+            return json.load(file)
+
+    # -------------- Benchmarks -----------------------------
+
+    @classmethod
+    def physics(cls) -> Result:
+        """PongMatch.update (what Pong.update runs) with scripted paddles."""
+        from pong.model.Config import PADDLE_SPEED
+        from pong.model.PongMatch import PongMatch
+        match = PongMatch(random.Random(cls.SEED))
+        match.load_entities()
+        moves = random.Random(cls.SEED)
+        speeds = [moves.choice([-PADDLE_SPEED, 0, PADDLE_SPEED]) for _ in range(64)]
+        start = perf_counter()
+        for frame in range(cls.PHYSICS_FRAMES):
+            if frame % 8 == 0:
+                match.left_paddle.accelerate(0, speeds[frame % 64])
+                match.right_paddle.accelerate(0, speeds[(frame + 32) % 64])
+            match.update()
+        return cls.PHYSICS_FRAMES / (perf_counter() - start), "steps/s", True
+
+    @classmethod
+    def batch_physics(cls) -> Result:
+        """PongBatch.step, frames summed over all matches."""
+        import numpy as np
+        from pong.model.PongBatch import PongBatch
+        batch = PongBatch(cls.BATCH_MATCHES, seed=cls.SEED)
+        actions = np.random.default_rng(cls.SEED).integers(0, 3, (cls.BATCH_FRAMES, cls.BATCH_MATCHES, 2))
+        start = perf_counter()
+        for frame in range(cls.BATCH_FRAMES):
+            batch.step(actions[frame])
+        return cls.BATCH_MATCHES * cls.BATCH_FRAMES / (perf_counter() - start), "frames/s", True
+
+    @classmethod
+    def env(cls) -> Result:
+        """PongEnv.step with velocities, transitions summed over all matches."""
+        import numpy as np
+        from pong.env.PongEnv import PongEnv
+        env = PongEnv(cls.BATCH_MATCHES, seed=cls.SEED, velocities=True)
+        env.reset()
+        actions = np.random.default_rng(cls.SEED).integers(0, 3, (cls.BATCH_FRAMES, cls.BATCH_MATCHES, 2))
+        start = perf_counter()
+        for frame in range(cls.BATCH_FRAMES):
+            env.step(actions[frame])
+        return cls.BATCH_MATCHES * cls.BATCH_FRAMES / (perf_counter() - start), "transitions/s", True
+
+    @classmethod
+    def decisions(cls) -> Result:
+        """FeedForwardNetwork.activate of the saved best AI, on random game states."""
+        import neat
+        from pong.AI.Trainer import Trainer
+        with open(os.path.join(Trainer.dir_path, "best_ai_object.pkl"), "rb") as file:
+            genome = pickle.load(file)
+        net = neat.nn.FeedForwardNetwork.create(genome, Trainer.load_config())
+        states = random.Random(cls.SEED)
+        inputs = [(states.uniform(0, 400), states.uniform(0, 400), states.uniform(0, 600)) for _ in range(1000)]
+        start = perf_counter()
+        for i in range(cls.DECISIONS):
+            output = net.activate(inputs[i % 1000])
+            output.index(max(output))
+        return cls.DECISIONS / (perf_counter() - start), "decisions/s", True
+
+    @classmethod
+    def policy_decisions(cls) -> Result:
+        """Policy.decide of the exported best AI (best_ai_policy.npz), on the same states."""
+        from pong.AI.Policy import Policy
+        from pong.AI.Trainer import Trainer
+        policy = Policy.load(os.path.join(Trainer.dir_path, "best_ai_policy.npz"))
+        states = random.Random(cls.SEED)
+        inputs = [(states.uniform(0, 400), states.uniform(0, 400), states.uniform(0, 600)) for _ in range(1000)]
+        start = perf_counter()
+        for i in range(cls.DECISIONS):
+            policy.decide(inputs[i % 1000])
+        return cls.DECISIONS / (perf_counter() - start), "decisions/s", True
+
+    @classmethod
+    def render(cls) -> Result:
+        """PongGUI.render of a running match, with the dummy video driver."""
+        import pygame
+        from pong.model.Pong import Pong
+        from pong.model.PongMatch import PongMatch
+        from pong.view.PongGUI import PongGUI
+        from pong.view.RenderCache import RenderCache
+        from pong.view.theme.Cool import Cool
+        PongGUI.init_pygame()
+        PongGUI.assets = Cool()
+        RenderCache.clear()
+        previous = Pong.match
+        Pong.use(PongMatch(random.Random(cls.SEED)))
+        Pong.load_entities()
+        try:
+            start = perf_counter()
+            for _ in range(cls.RENDER_FRAMES):
+                Pong.update()
+                PongGUI.render()
+            elapsed = perf_counter() - start
+        finally:
+            Pong.use(previous)
+            pygame.quit()
+        return cls.RENDER_FRAMES / elapsed, "frames/s", True
+
+    @classmethod
+    def offscreen(cls) -> Result:
+        """OffscreenRenderer.render_batch of a PongBatch, small greyscale frames summed over all matches."""
+        import numpy as np
+        from pong.model.PongBatch import PongBatch
+        from pong.view.OffscreenRenderer import OffscreenRenderer
+        from pong.view.RenderCache import RenderCache
+        RenderCache.clear()
+        renderer = OffscreenRenderer(cls.OFFSCREEN_SIZE, grey=True)
+        batch = PongBatch(cls.BATCH_MATCHES, seed=cls.SEED)
+        actions = np.random.default_rng(cls.SEED).integers(0, 3, (cls.OFFSCREEN_FRAMES, cls.BATCH_MATCHES, 2))
+        start = perf_counter()
+        for frame in range(cls.OFFSCREEN_FRAMES):
+            batch.step(actions[frame])
+            renderer.render_batch(batch)
+        return cls.BATCH_MATCHES * cls.OFFSCREEN_FRAMES / (perf_counter() - start), "frames/s", True
+
+    @classmethod
+    def matches(cls) -> Result:
+        """Headless matches of a small random population, played in-process."""
+        from pong.AI.MatchEvaluator import MatchEvaluator
+        population = cls.__population()
+        genomes, config = list(population.population.values()), population.config
+        evaluator = MatchEvaluator(workers=1, seed=cls.SEED)
+        pairs = [(genome1, genome2) for genome1 in genomes[:8] for genome2 in genomes[8:]]
+        start = perf_counter()
+        evaluator.play(config, pairs)
+        return len(pairs) / (perf_counter() - start), "matches/s", True
+
+    @classmethod
+    def generation(cls) -> Result:
+        """One generation (evaluation and reproduction) of a small population, MatchEvaluator in-process."""
+        from pong.AI.MatchEvaluator import MatchEvaluator
+        return cls.__generation(MatchEvaluator(workers=1, seed=cls.SEED))
+
+    @classmethod
+    def generation_batched(cls) -> Result:
+        """Like generation, with the BatchEvaluator."""
+        from pong.AI.BatchEvaluator import BatchEvaluator
+        return cls.__generation(BatchEvaluator(seed=cls.SEED))
+
+    @classmethod
+    def import_time(cls, module: str) -> Result:
+        """Time to import given module in a fresh interpreter."""
+        code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                                env=dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1"))
+        return 1000 * float(output.stdout.split()[-1]), "ms", False
+
+    # ---------- Helpers ------------------------
+
+    @classmethod
+    def __population(cls):
+        """Returns a small population, the same for every run."""
+        import neat
+        from pong.AI.Trainer import Trainer
+        random.seed(cls.SEED)
+        config = Trainer.load_config()
+        config.pop_size = cls.POPULATION
+        return neat.Population(config)
+
+    @classmethod
+    def __generation(cls, evaluator) -> Result:
+        population = cls.__population()
+        start = perf_counter()
+        try:
+            population.run(evaluator, 1)
+        finally:
+            evaluator.close()
+        return perf_counter() - start, "s", False
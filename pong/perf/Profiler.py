@@ -0,0 +1,143 @@
+# package pong.perf
+from collections import deque
+from time import perf_counter
+from typing import Dict, List
+import json
+import math
+import time
+
+class Profiler:
+    """
+    Per-phase frame timings for the game and training loops.
+
+    Loops read Profiler.enabled once and only time their phases (events, activate, dispatch,
+    update, render, tick) when it is set, so a disabled profiler costs one attribute
+    read per loop. Samples are kept in a rolling window per phase and summarised
+    as p50/p95/p99 in milliseconds, shown by the overlay and dumped as JSONL.
+    """
+    WINDOW = 600            # Samples kept per phase
+    SUMMARY_INTERVAL = 0.5  # Seconds between overlay refreshes
+
+    enabled = False
+    overlay = False       # Draw the summary on screen (see PongGUI.draw_profile)?
+    dump_path = None      # JSONL file a summary is appended to every dump_interval seconds
+    dump_interval = 5.0
+
+    samples = {}          # Phase name -> deque of seconds
+    frames = 0
+    last_dump = 0.0
+    lines = []            # Overlay text, refreshed every SUMMARY_INTERVAL
+    last_lines = 0.0
+    instrumented = []     # (owner, name, original) of methods timed as a phase
+
+    @classmethod
+    def enable(cls, overlay: bool = False, dump_path: str = None, dump_interval: float = 5.0,
+               window: int = WINDOW):
+        """Starts profiling, including PongMatch.check_collisions (part of update)."""
+        from pong.model.PongMatch import PongMatch
+        cls.disable()
+        cls.enabled = True
+        cls.overlay = overlay
+        cls.dump_path = dump_path
+        cls.dump_interval = dump_interval
+        cls.WINDOW = window
+        cls.samples = {}
+        cls.frames = 0
+        cls.last_dump = cls.last_lines = perf_counter()
+        cls.lines = []
+        cls.instrument(PongMatch, "check_collisions", "collisions")
+
+    @classmethod
+    def disable(cls):
+        """Stops profiling and restores instrumented methods."""
+        cls.enabled = False
+        cls.overlay = False
+        for owner, name, original in reversed(cls.instrumented):
+            setattr(owner, name, original)
+        cls.instrumented = []
+
+    @classmethod
+    def instrument(cls, owner: type, name: str, phase: str):
+        """Times every call of owner.name as phase, until disabled. Costs nothing when not profiling."""
+        original = owner.__dict__[name]
+
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                cls.record(phase, perf_counter() - start)
+
+        setattr(owner, name, timed)
+        cls.instrumented.append((owner, name, original))
+
+    # -------------- Recording -----------------------------
+
+    @classmethod
+    def lap(cls, phase: str, start: float) -> float:
+        """Records the time since start as phase, returns now (the start of the next phase)."""
+        now = perf_counter()
+        cls.record(phase, now - start)
+        return now
+
+    @classmethod
+    def record(cls, phase: str, seconds: float):
+        samples = cls.samples.get(phase)
+        if samples is None:
+            samples = cls.samples[phase] = deque(maxlen=cls.WINDOW)
+        samples.append(seconds)
+
+    @classmethod
+    def end_frame(cls, start: float):
+        """Records the whole frame since start, dumping the summary when due."""
+        now = cls.lap("frame", start)
+        cls.frames += 1
+        if cls.dump_path is not None and now - cls.last_dump >= cls.dump_interval:
+            cls.last_dump = now
+            cls.dump()
+
+    # -------------- Reporting -----------------------------
+
+    @classmethod
+    def summary(cls) -> Dict[str, Dict[str, float]]:
+        """Returns count, mean, p50, p95 and p99 (in ms) of the current window, per phase."""
+        summary = {}
+        for phase, samples in cls.samples.items():
+            ordered = sorted(samples)
+            if not ordered:
+                continue
+            summary[phase] = {
+                "count": len(ordered),
+                "mean": 1000 * sum(ordered) / len(ordered),
+                "p50": 1000 * cls.__percentile(ordered, 50),
+                "p95": 1000 * cls.__percentile(ordered, 95),
+                "p99": 1000 * cls.__percentile(ordered, 99),
+            }
+        return summary
+
+    @classmethod
+    def summary_lines(cls) -> List[str]:
+        """Returns the summary as text lines for the overlay, recomputed every SUMMARY_INTERVAL."""
+        now = perf_counter()
+        if not cls.lines or now - cls.last_lines >= cls.SUMMARY_INTERVAL:
+            cls.last_lines = now
+            cls.lines = [
+                f"{phase:<10} {s['p50']:6.2f} {s['p95']:6.2f} {s['p99']:6.2f} ms"
+                for phase, s in cls.summary().items()
+            ]
+        return cls.lines
+
+    @classmethod
+    def dump(cls):
+        """Appends the current summary as one JSON line to dump_path."""
+        line = {"time": time.time(), "frames": cls.frames, "phases": cls.summary()}
+        with open(cls.dump_path, "a") as output:
+            output.write(json.dumps(line) + "\n")
+
+    # ---------- Helpers ------------------------
+
+    @staticmethod
+    def __percentile(ordered: list, percent: float) -> float:
+        """Nearest rank percentile of sorted samples."""
+        index = max(0, min(len(ordered) - 1, math.ceil(percent / 100 * len(ordered)) - 1))
+        return ordered[index]
@@ -3,6 +3,7 @@
 from abc import abstractmethod, ABC
 
 import pygame.color
+import pygame.display
 import pygame.image
 import pygame.mixer
 
@@ -19,8 +20,10 @@ class Assets(ABC):
     IMAGE_DIR = "assets/img/"
     SOUND_DIR = "assets/sound/"
 
-    # A Map to store which image belongs to which object
+    # Maps to store which image belongs to which object, and to which class.
+    # A class binding also covers its subclasses, resolved when binding
     object_image_map = {}
+    type_image_map = {}
 
     # ------------ Handling Colors and Images ------------------------
     color_fg_text = pygame.color.THECOLORS['white']
@@ -29,9 +32,24 @@ class Assets(ABC):
     left_paddle_img_file = "coolbluepaddle.png"
     right_paddle_img_file = "coolredpaddle.png"
 
+    # Sprite sheet (atlas) of the theme, if any, and the region of each bound class in it
+    atlas_file = None
+    atlas_regions = {}
+
+    # Loaded images and atlases by file name, shared by all themes
+    images = {}
+    atlases = {}
+
     # -------------- Audio handling -----------------------------
     ball_hit_paddle_sound_file = "ballhitpaddle.wav"
 
+    SOUND_CHANNELS = 4  # Mixer channels reserved for sound effects
+
+    # Decoded sounds by file name, and the reserved channels they play on
+    sounds = {}
+    channels = []
+    next_channel = 0
+
     @classmethod
     @abstractmethod
     def get_background(cls):  # Implemented by subclasses
@@ -43,28 +61,112 @@ class Assets(ABC):
     def bind(cls, obj, image_file_name):
         i = cls.get_image(image_file_name)
         if i is not None:
-            cls.object_image_map.update({obj: i})
+            cls.__bind_image(obj, i)
         else:
             raise ValueError("Missing image: " + cls.IMAGE_DIR + image_file_name)
 
+    @classmethod
+    def bind_region(cls, obj, atlas_file, region):
+        """Binds obj to a (x, y, width, height) region of an atlas image."""
+        atlas = cls.get_atlas(atlas_file)
+        cls.__bind_image(obj, atlas.subsurface(region))
+
+    @classmethod
+    def bind_atlas(cls):
+        """Binds all atlas_regions declared by the theme."""
+        for obj, region in cls.atlas_regions.items():
+            cls.bind_region(obj, cls.atlas_file, region)
+
     # Get image to render
     @classmethod
     def get(cls, obj):
-        i = cls.object_image_map.get(obj)  # Try to find bound object
-        if i is None:
-            return cls.get_for_type(type(obj))  # .. if fail, check if class bound
-        return i  # possible None, will throw exception, OK!
+        if cls.object_image_map:
+            i = cls.object_image_map.get(obj)  # Try to find bound object
+            if i is not None:
+                return i
+        return cls.get_for_type(type(obj))  # .. else the class binding, possible None, will throw exception, OK!
 
     @classmethod
     def get_for_type(cls, clazz):
-        return cls.object_image_map.get(clazz)
+        i = cls.type_image_map.get(clazz)
+        if i is None:
+            # A class created after binding, e.g. a buffer backed entity, resolve it once
+            i = next((cls.type_image_map[base] for base in clazz.__mro__ if base in cls.type_image_map), None)
+            if i is not None:
+                cls.type_image_map.update({clazz: i})
+        return i
 
     # ---------- Helpers ------------------------
+    @classmethod
+    def __bind_image(cls, obj, image):
+        if not isinstance(obj, type):
+            cls.object_image_map.update({obj: image})
+            return
+        # Resolve the class and its subclasses now, so drawing is a single lookup by type
+        classes = [obj]
+        while classes:
+            clazz = classes.pop()
+            cls.type_image_map.update({clazz: image})
+            classes.extend(clazz.__subclasses__())
+
     @classmethod
     def get_image(cls, file_name):
-        return pygame.image.load(cls.IMAGE_DIR + file_name)
+        """Returns the image, loaded only once: binding a theme again reuses its images."""
+        image = Assets.images.get(file_name)
+        if image is None:
+            image = pygame.image.load(cls.IMAGE_DIR + file_name)
+            Assets.images[file_name] = image
+        return image
+
+    @classmethod
+    def get_atlas(cls, file_name):
+        """Returns the atlas image, loaded (and converted for fast blits) only once."""
+        atlas = Assets.atlases.get(file_name)
+        if atlas is None:
+            atlas = cls.get_image(file_name)
+            if pygame.display.get_surface() is not None:
+                atlas = atlas.convert_alpha()
+            Assets.atlases[file_name] = atlas
+        return atlas
 
     @classmethod
     def get_sound(cls, file_name):
         return pygame.mixer.Sound(cls.SOUND_DIR + file_name)
 
+    # -------------- Sound playback -----------------------------
+
+    @classmethod
+    def preload_sounds(cls):
+        """Decodes the sounds of the theme and reserves the mixer channels, if the mixer is running."""
+        if not pygame.mixer.get_init():
+            return
+        cls.load_sound(cls.ball_hit_paddle_sound_file)
+        cls.__reserve_channels()
+
+    @classmethod
+    def load_sound(cls, file_name):
+        """Returns the decoded sound, reading the file only the first time."""
+        sound = Assets.sounds.get(file_name)
+        if sound is None:
+            sound = cls.get_sound(file_name)
+            Assets.sounds[file_name] = sound
+        return sound
+
+    @classmethod
+    def play_sound(cls, file_name):
+        """Plays the (preloaded) sound on the next reserved channel, without waiting for it."""
+        sound = Assets.sounds.get(file_name)
+        if sound is None:
+            sound = cls.load_sound(file_name)
+        if not Assets.channels:
+            cls.__reserve_channels()
+        channel = Assets.channels[Assets.next_channel]
+        Assets.next_channel = (Assets.next_channel + 1) % len(Assets.channels)
+        channel.play(sound)
+
+    @classmethod
+    def __reserve_channels(cls):
+        if not Assets.channels:
+            pygame.mixer.set_reserved(cls.SOUND_CHANNELS)
+            Assets.channels = [pygame.mixer.Channel(i) for i in range(cls.SOUND_CHANNELS)]
+
@@ -0,0 +1,120 @@
+# package pong.view
+from typing import Sequence, Tuple, Union
+import numpy as np
+import pygame
+from pong.model.Ball import Ball
+from pong.model.Config import *
+from pong.model.Paddle import Paddle
+from pong.model.Pong import Pong
+from pong.model.PongBatch import PongBatch
+from pong.view.RenderCache import RenderCache
+
+class OffscreenRenderer:
+    """
+    Renders matches into numpy arrays, for agents learning from pixels.
+
+    Draws what PongGUI.render does (background and entities, no texts) onto a reusable
+    surface of the requested size, without ever opening a display, so it runs headless
+    (SDL dummy video driver) and in training workers. Images are scaled to that size once,
+    and with grey also converted to greyscale once: blending and scaling are linear, so
+    the frames come out grey with no per-pixel conversion.
+
+    The surface stores its pixels as rows of R, G, B bytes, the layout of a (height, width, 3)
+    array, so a frame is a single copy out of its buffer. render returns frame, a (height,
+    width, 3) uint8 array, (height, width) with grey, overwritten by every render: copy what you keep.
+    """
+    RGB_MASKS = (0xFF, 0xFF00, 0xFF0000, 0)  # Byte order of the canvas pixels
+
+    def __init__(self, size: Tuple[int, int] = (GAME_WIDTH, GAME_HEIGHT), grey: bool = False, assets=None):
+        if assets is None:
+            from pong.view.theme.Cool import Cool
+            assets = Cool()
+        self.size = (int(size[0]), int(size[1]))
+        self.grey = grey
+        self.assets = assets
+        self.scale_x = self.size[0] / GAME_WIDTH
+        self.scale_y = self.size[1] / GAME_HEIGHT
+        self.shape = (self.size[1], self.size[0]) + (() if grey else (3,))
+        self.images = {}  # Prepared images by source image and size
+
+        self.canvas = pygame.Surface(self.size, 0, 24, self.RGB_MASKS)
+        self.frame = np.empty(self.shape, dtype=np.uint8)
+        self.frames = None  # Reused by render_batch
+        # In the canvas format, the blit drawing it every frame is then a plain copy
+        self.background = pygame.Surface(self.size, 0, self.canvas)
+        self.background.blit(self.__image(assets.get_background(), self.size), (0, 0))
+
+    def render(self, match=Pong) -> np.ndarray:
+        """Renders a match (the current one by default), returns frame."""
+        self.__draw(match)
+        self.__copy(self.frame)
+        return self.frame
+
+    def render_batch(self, matches: Union[PongBatch, Sequence], out: np.ndarray = None) -> np.ndarray:
+        """
+        Renders every match of a PongBatch (or a sequence of matches) into out, an
+        (n, height, width[, 3]) uint8 array, by default one reused between calls. Returns out.
+        """
+        n = matches.n if isinstance(matches, PongBatch) else len(matches)
+        if out is None:
+            if self.frames is None or len(self.frames) != n:
+                self.frames = np.empty((n,) + self.shape, dtype=np.uint8)
+            out = self.frames
+        elif out.shape != (n,) + self.shape:
+            raise ValueError(f"Expected an output of shape {(n,) + self.shape}, got {out.shape}")
+
+        if not isinstance(matches, PongBatch):
+            for i, match in enumerate(matches):
+                self.__draw(match)
+                self.__copy(out[i])
+            return out
+
+        scale_x, scale_y = self.scale_x, self.scale_y
+        paddle = self.__image(self.assets.get_for_type(Paddle), (PADDLE_WIDTH * scale_x, PADDLE_HEIGHT * scale_y))
+        ball = self.__image(self.assets.get_for_type(Ball), (BALL_WIDTH * scale_x, BALL_HEIGHT * scale_y))
+        right_x = PongBatch.PADDLE_X[1] * scale_x
+        # Python floats, indexing numpy arrays per match is slow
+        left_y = (matches.paddle_y[:, 0] * scale_y).tolist()
+        right_y = (matches.paddle_y[:, 1] * scale_y).tolist()
+        ball_x = (matches.ball_x * scale_x).tolist()
+        ball_y = (matches.ball_y * scale_y).tolist()
+        canvas, background = self.canvas, self.background
+        for i in range(n):
+            canvas.blit(background, (0, 0))
+            canvas.blits(((paddle, (0, left_y[i])), (paddle, (right_x, right_y[i])),
+                          (ball, (ball_x[i], ball_y[i]))), doreturn=False)
+            self.__copy(out[i])
+        return out
+
+    # ---------- Helpers ------------------------
+
+    def __draw(self, match):
+        scale_x, scale_y = self.scale_x, self.scale_y
+        canvas = self.canvas
+        canvas.blit(self.background, (0, 0))
+        canvas.blits([
+            (self.__image(self.assets.get(entity), (entity.get_width() * scale_x, entity.get_height() * scale_y)),
+             (entity.get_x() * scale_x, entity.get_y() * scale_y))
+            for entity in match.entities
+        ], doreturn=False)
+
+    def __copy(self, out: np.ndarray):
+        """Copies the canvas pixels into out, the only copy of a frame."""
+        width, height = self.size
+        # Locks the canvas for blits until the view is dropped, at the end of this call
+        pixels = np.frombuffer(self.canvas.get_buffer(), dtype=np.uint8)
+        pixels = pixels.reshape(height, self.canvas.get_pitch())[:, :width * 3].reshape(height, width, 3)
+        # All channels are equal in grey, red is enough
+        out[...] = pixels[..., 0] if self.grey else pixels
+
+    def __image(self, image: pygame.Surface, size: Tuple[float, float]) -> pygame.Surface:
+        """Returns given image scaled to size (at least a pixel), and greyscale if grey, preparing it only once."""
+        size = (max(1, int(size[0])), max(1, int(size[1])))
+        key = (image, size)
+        prepared = self.images.get(key)
+        if prepared is None:
+            prepared = RenderCache.scaled(image, size)
+            if self.grey:
+                prepared = pygame.transform.grayscale(prepared)
+            self.images[key] = prepared
+        return prepared
@@ -7,9 +7,12 @@ from pong.model import *
 from pong.model.Config import *
 from pong.model.Entity import Entity
 from pong.model.Pong import Pong
+from pong.perf.Profiler import Profiler
 from pong.view.theme.Cool import Cool
 from pong.view.theme.Duckie import Duckie
+from pong.view.theme.Neon import Neon
 from pong.view.Assets import Assets
+from pong.view.RenderCache import RenderCache
 from typing import Tuple
 import time
 
@@ -25,6 +28,12 @@ class PongGUI:
     running = False    # Is game running?
     stop_game = False  # Should game stop?
     assets = None # Assets for the game
+    dirty_rects = False  # Only redraw and push the parts of the screen that changed?
+    drawn_rects = None   # What the last frame drew (entities, texts), None forces a full redraw
+    drawn_texts = None   # Scoreboard and hits shown by the last frame
+    recorder = None      # MatchRecorder recording the matches played, if any
+    THEMES = {"cool": Cool, "duckie": Duckie, "neon": Neon}  # By name, see run.py --theme
+    theme = Cool         # Assets class of the theme, created by run
     
     # ------- Keyboard handling ----------------------------------
 
@@ -95,7 +104,7 @@ class PongGUI:
         def on_model_event(self, evt: ModelEvent):
             if evt.event_type == ModelEvent.EventType.BALL_HIT_PADDLE:
                 filename = Assets.ball_hit_paddle_sound_file
-                Assets.get_sound(filename).play()
+                Assets.play_sound(filename)
             elif evt.event_type == ModelEvent.EventType.BALL_HIT_WALL_CEILING:
                 # TODO Optional
                 pass
@@ -106,11 +115,19 @@ class PongGUI:
     # ---------- View handling ------------------------------
 
     @classmethod
-    def draw_entity(cls, entity: Entity):
-        """Draws an entity on the screen."""
-        image = cls.assets.get(entity)
-        image = pygame.transform.scale(image, (entity.get_width(), entity.get_height()))
-        cls.screen.blit(image, (entity.get_x(), entity.get_y()))        
+    def draw_entity(cls, entity: Entity) -> pygame.Rect:
+        """Draws an entity on the screen, returns the area drawn."""
+        image = RenderCache.scaled(cls.assets.get(entity), (entity.get_width(), entity.get_height()))
+        return cls.screen.blit(image, (entity.get_x(), entity.get_y()))
+
+    @classmethod
+    def draw_entities(cls, entities) -> list:
+        """Draws all entities with a single blits call, returns the areas drawn."""
+        return cls.screen.blits([
+            (RenderCache.scaled(cls.assets.get(entity), (entity.get_width(), entity.get_height())),
+             (entity.get_x(), entity.get_y()))
+            for entity in entities
+        ])
 
     @classmethod
     def reset_screen(cls):
@@ -118,20 +135,26 @@ class PongGUI:
         # Clear screen
         cls.screen.fill((0, 0, 0))
         # Draw Background
-        background_pic = pygame.transform.scale( cls.assets.get_background(), (GAME_WIDTH, GAME_HEIGHT))
+        background_pic = RenderCache.scaled(cls.assets.get_background(), (GAME_WIDTH, GAME_HEIGHT))
         cls.screen.blit(background_pic, (0, 0))
 
     @classmethod
-    def draw_scoreboard(cls):
+    def draw_scoreboard(cls) -> pygame.Rect:
         """Draws the scoreboard on the screen."""
         text = f"P1: {Pong.get_points_left()}, P2: {Pong.get_points_right()}"
-        cls.__display_text(text, 22, (255,255,255), (GAME_WIDTH/2, 20), (0,0,0))
+        return cls.__display_text(text, 22, (255,255,255), (GAME_WIDTH/2, 20), (0,0,0))
 
     @classmethod
-    def draw_hits(cls):
+    def draw_hits(cls) -> pygame.Rect:
         l_hits, r_hits = Pong.get_hits()
         text = f"Left: {l_hits}, Right: {r_hits}"
-        cls.__display_text(text, 22, (255,255,255), (GAME_WIDTH/2, 40))
+        return cls.__display_text(text, 22, (255,255,255), (GAME_WIDTH/2, 40))
+
+    @classmethod
+    def draw_profile(cls):
+        """Draws the frame phase timings (p50, p95, p99) in the top left corner."""
+        for i, line in enumerate(Profiler.summary_lines()):
+            cls.screen.blit(RenderCache.text(line, 18, (255, 255, 0), (0, 0, 0)), (5, 5 + 15 * i))
 
     @classmethod
     def __display_text(
@@ -145,48 +168,88 @@ class PongGUI:
         """Displays given text in the center of the screen."""
         position = (GAME_WIDTH/2, GAME_HEIGHT/2) if position == None else position
 
-        text = cls.__create_text_element(text, size, color)
+        text = cls.__create_text_element(text, size, color, fill)
         text_rect = text.get_rect(center=position)
-        if fill != None:
-            temp_surface = pygame.Surface(text.get_size())
-            temp_surface.fill(fill)
-            temp_surface.blit(text, (0,0))
-            cls.screen.blit(temp_surface, text_rect)
-        else:
-            cls.screen.blit(text, text_rect)
+        return cls.screen.blit(text, text_rect)
 
     @classmethod 
-    def __create_text_element(cls, text: str, size: int, color: Tuple[int, int, int]):
-        font = pygame.font.Font(None, size)
-        final_text = font.render(text, True, color)
-        return final_text
+    def __create_text_element(cls, text: str, size: int, color: Tuple[int, int, int], fill: Tuple[int, int, int] = None):
+        return RenderCache.text(text, size, color, fill)
 
     @classmethod
     def render(cls):
         """Renders the View."""
+        # The profile overlay changes every frame, so it is always drawn with a full redraw
+        if cls.dirty_rects and cls.drawn_rects is not None and not Pong.get_winner() and not Profiler.overlay:
+            cls.render_dirty()
+            return
+
         # Reset Screen and draw background
         cls.reset_screen()
         # Draw entities
-        for entity in Pong.entities:
-            cls.draw_entity(entity)
+        entity_rects = cls.draw_entities(Pong.entities)
 
         # Draw scoreboard
-        cls.draw_hits()
-        cls.draw_scoreboard()
+        text_rects = [cls.draw_hits(), cls.draw_scoreboard()]
+        cls.drawn_rects = (entity_rects, text_rects)
+        cls.drawn_texts = cls.__texts()
+        if Profiler.overlay:
+            cls.draw_profile()
         
         player_won = Pong.get_winner()
         if player_won:
             cls.win_screen(player_won)
+            cls.drawn_rects = None
 
         # Update screen
         pygame.display.flip()
+
+    @classmethod
+    def render_dirty(cls):
+        """
+        Renders the View by restoring the background only under what the last frame drew,
+        redrawing the entities and changed (or overdrawn) texts, and pushing just those areas.
+        """
+        background = RenderCache.scaled(cls.assets.get_background(), (GAME_WIDTH, GAME_HEIGHT))
+        old_entity_rects, old_text_rects = cls.drawn_rects
+        entities = Pong.entities
+        # Texts are drawn on top, so redraw them when changed or when an entity touches them
+        touched = old_entity_rects + [
+            pygame.Rect(entity.get_x(), entity.get_y(), entity.get_width(), entity.get_height())
+            for entity in entities
+        ]
+        texts = cls.__texts()
+        redraw_texts = texts != cls.drawn_texts or any(rect.collidelist(touched) != -1 for rect in old_text_rects)
+
+        # Background first, so entities under the texts are drawn again before them, as in render
+        for rect in old_entity_rects + (old_text_rects if redraw_texts else []):
+            cls.screen.blit(background, rect, rect)
+        entity_rects = cls.draw_entities(entities)
+        dirty = old_entity_rects + entity_rects
+
+        text_rects = old_text_rects
+        if redraw_texts:
+            text_rects = [cls.draw_hits(), cls.draw_scoreboard()]
+            dirty += old_text_rects + text_rects
+            cls.drawn_texts = texts
+
+        cls.drawn_rects = (entity_rects, text_rects)
+        pygame.display.update(dirty)
+
+    @classmethod
+    def __texts(cls) -> Tuple:
+        """Returns what the scoreboard and hits texts show."""
+        return Pong.get_points_left(), Pong.get_points_right(), Pong.get_hits()
        
     @classmethod
     def new_game(cls):
         """Starts a new game."""
         Pong.reset_points()
         Pong.load_entities()
+        cls.drawn_rects = None
         cls.running = True
+        if cls.recorder is not None:
+            cls.recorder.begin_match(Pong.match, int(time.time()))
 
     @classmethod
     def kill_game(cls):
@@ -199,6 +262,7 @@ class PongGUI:
         """Pauses the game."""
         cls.running = False
         cls.__display_text("Paused", 50, (255, 255, 255))
+        cls.drawn_rects = None
         
     @classmethod
     def win_screen(cls, player_side: int):
@@ -217,6 +281,7 @@ class PongGUI:
         pygame.init()
         pygame.display.set_caption("Pong")
         cls.screen = pygame.display.set_mode((GAME_WIDTH, GAME_HEIGHT))
+        cls.drawn_rects = None
         cls.clock = pygame.time.Clock()
 
     @classmethod
@@ -226,22 +291,44 @@ class PongGUI:
         cls.running = True
         cls.init_pygame()
         # Load assets
-        cls.assets = Cool()
+        cls.assets = cls.theme()
         Pong.load_entities()
-        # Initialize model
-        EventBus.register(cls.ModelEventHandler())
+        # Initialize model, its events are handled once per frame (after the update)
+        EventBus.register(cls.ModelEventHandler(),
+                          ModelEvent.EventType.BALL_HIT_PADDLE, ModelEvent.EventType.BALL_HIT_WALL_CEILING)
+        EventBus.deferred = True
+        if cls.recorder is not None:
+            cls.recorder.begin_match(Pong.match, int(time.time()))
 
         # Main game loop
+        profile = Profiler.enabled
         while not cls.stop_game:
+            if profile:
+                start = lap = time.perf_counter()
             # Handle events
             cls.handle_events()
+            if profile:
+                lap = Profiler.lap("events", lap)
             if cls.running:
                 # Update model
                 Pong.update()
+                if cls.recorder is not None:
+                    cls.recorder.record(Pong.match)
+                if profile:
+                    lap = Profiler.lap("update", lap)
+                # Handle model events (sounds)
+                EventBus.drain()
+                if profile:
+                    lap = Profiler.lap("dispatch", lap)
                 # Render
                 cls.render()
+                if profile:
+                    lap = Profiler.lap("render", lap)
             # Tick
             cls.clock.tick(60)
+            if profile:
+                Profiler.lap("tick", lap)
+                Profiler.end_frame(start)
         pygame.quit()
 
     @classmethod
@@ -0,0 +1,68 @@
+# package pong.view
+import pygame
+from typing import Tuple
+
+class RenderCache:
+    """
+    Caches what PongGUI would otherwise rebuild every frame:
+    scaled images (per source image and size), fonts (per size)
+    and rendered text surfaces (per text, size and colors).
+    """
+    MAX_SCALED = 64  # Scaled images kept before the image cache is emptied
+    MAX_TEXTS = 64  # Rendered texts kept before the text cache is emptied
+
+    scaled_images = {}
+    fonts = {}
+    texts = {}
+
+    @classmethod
+    def scaled(cls, image: pygame.Surface, size: Tuple[int, int]) -> pygame.Surface:
+        """Returns given image scaled to size, scaling it only the first time."""
+        size = (int(size[0]), int(size[1]))
+        key = (image, size)
+        scaled = cls.scaled_images.get(key)
+        if scaled is None:
+            scaled = image if image.get_size() == size else pygame.transform.scale(image, size)
+            if len(cls.scaled_images) >= cls.MAX_SCALED:
+                cls.scaled_images.clear()
+            cls.scaled_images[key] = scaled
+        return scaled
+
+    @classmethod
+    def font(cls, size: int) -> pygame.font.Font:
+        """Returns the default font in given size."""
+        font = cls.fonts.get(size)
+        if font is None:
+            font = pygame.font.Font(None, size)
+            cls.fonts[size] = font
+        return font
+
+    @classmethod
+    def text(
+        cls,
+        text: str,
+        size: int,
+        color: Tuple[int, int, int],
+        fill: Tuple[int, int, int] = None,
+    ) -> pygame.Surface:
+        """Returns given text rendered (on a fill colored box, if any), rendering it only when it changed."""
+        key = (text, size, color, fill)
+        surface = cls.texts.get(key)
+        if surface is None:
+            surface = cls.font(size).render(text, True, color)
+            if fill is not None:
+                box = pygame.Surface(surface.get_size())
+                box.fill(fill)
+                box.blit(surface, (0, 0))
+                surface = box
+            if len(cls.texts) >= cls.MAX_TEXTS:
+                cls.texts.clear()
+            cls.texts[key] = surface
+        return surface
+
+    @classmethod
+    def clear(cls):
+        """Drops everything, e.g. after switching theme."""
+        cls.scaled_images.clear()
+        cls.fonts.clear()
+        cls.texts.clear()
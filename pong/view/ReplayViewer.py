@@ -0,0 +1,153 @@
+# package pong.view
+import numpy as np
+import pygame
+from pong.model.MatchRecorder import MatchRecorder
+from pong.model.Pong import Pong
+from pong.model.PongMatch import PongMatch
+from pong.view.PongGUI import PongGUI
+from pong.view.RenderCache import RenderCache
+
+class ReplayViewer(PongGUI):
+    """
+    Replays a match recording (see MatchRecorder) with the game's renderer.
+
+    The recording is memory-mapped, so it opens instantly whatever its size and
+    seeking to a frame is an array lookup. Frames written after opening (by a
+    training run still recording) are picked up on reaching the end.
+
+    Keys: space/escape pause, left/right step one frame, up/down next/previous
+    rally, page up/down next/previous match, home/end first/last frame, +/- speed.
+    """
+    FPS = 60
+    DECISIONS = {0: "keep", 1: "up", 2: "down", MatchRecorder.NO_DECISION: "-"}
+
+    path = None
+    records = None
+    starts = None    # Index of the match and rally starts
+    position = 0     # Record shown
+    speed = 1        # Records advanced per frame
+
+    @classmethod
+    def run(cls, path: str, start: int = 0, match: int = None):
+        """Replays the recording at path, from record start or from the match with given id."""
+        cls.path = path
+        cls.reload()
+        if match is not None:
+            found = np.flatnonzero(cls.records["match"] == match)
+            if len(found) == 0:
+                raise ValueError(f"No match {match} in {path}")
+            start = int(found[0])
+        cls.position = min(max(start, 0), max(len(cls.records) - 1, 0))
+
+        cls.running = True
+        cls.init_pygame()
+        cls.assets = cls.theme()
+        previous = Pong.match
+        replay = PongMatch()
+        replay.load_entities()
+        Pong.use(replay)
+        try:
+            while not cls.stop_game:
+                cls.handle_events()
+                if cls.running:
+                    cls.seek(cls.position + cls.speed)
+                if len(cls.records):
+                    cls.show(cls.records[cls.position])
+                cls.clock.tick(cls.FPS)
+        finally:
+            Pong.use(previous)
+            pygame.quit()
+
+    @classmethod
+    def reload(cls):
+        """Maps the recording again, including what has been written since."""
+        cls.records = MatchRecorder.read(cls.path)
+        cls.starts = MatchRecorder.read_index(cls.path)
+
+    @classmethod
+    def seek(cls, position: int):
+        """Moves to given record, pausing at the end of the recording."""
+        last = len(cls.records) - 1
+        if position > last:
+            cls.reload()
+            last = len(cls.records) - 1
+        if position >= last:
+            cls.running = False
+        cls.position = min(max(position, 0), max(last, 0))
+
+    @classmethod
+    def seek_start(cls, forward: bool, kind: int = None):
+        """Moves to the next (or previous) rally start, or only match start with kind MATCH_START."""
+        starts = cls.starts if kind is None else cls.starts[cls.starts["kind"] == kind]
+        records = starts["record"]
+        if forward:
+            i = np.searchsorted(records, cls.position, side="right")
+            if i < len(records):
+                cls.seek(int(records[i]))
+        else:
+            # Previous start, skipping the one just reached
+            i = np.searchsorted(records, cls.position, side="left") - 1
+            if i >= 0:
+                cls.seek(int(records[i]))
+
+    @classmethod
+    def show(cls, record):
+        """Puts the recorded state into the match and renders it."""
+        match = Pong.match
+        ball = match.ball
+        ball.x, ball.y = float(record["ball_x"]), float(record["ball_y"])
+        ball.dx, ball.dy = float(record["ball_dx"]), float(record["ball_dy"])
+        match.left_paddle.y, match.left_paddle.dy = float(record["left_y"]), float(record["left_dy"])
+        match.right_paddle.y, match.right_paddle.dy = float(record["right_y"]), float(record["right_dy"])
+        match.points_left, match.points_right = int(record["points_left"]), int(record["points_right"])
+        match.left_hits, match.right_hits = int(record["left_hits"]), int(record["right_hits"])
+
+        cls.render()
+        pygame.display.update(cls.draw_info(record))
+
+    @classmethod
+    def draw_info(cls, record) -> pygame.Rect:
+        """Draws where the replay is and what happened in the frame, in the bottom left corner."""
+        events = int(record["events"])
+        text = (f"match {record['match']}  frame {record['frame']}  "
+                f"record {cls.position + 1}/{len(cls.records)}  x{cls.speed}  "
+                f"AI: {cls.DECISIONS.get(int(record['decision_left']), '?')}"
+                f"/{cls.DECISIONS.get(int(record['decision_right']), '?')}"
+                + ("  hit" if events & MatchRecorder.PADDLE_HIT else "")
+                + ("  wall" if events & MatchRecorder.WALL_HIT else "")
+                + ("  point" if events & MatchRecorder.POINT else ""))
+        # Changes every frame, so rendered directly rather than through the text cache
+        surface = RenderCache.font(18).render(text, True, (255, 255, 0), (0, 0, 0))
+        return cls.screen.blit(surface, (5, cls.screen.get_height() - 18))
+
+    @classmethod
+    def key_pressed(cls, event):
+        """Handles the pygame.KEYDOWN event."""
+        if event.key in (pygame.K_SPACE, pygame.K_ESCAPE):
+            cls.running = not cls.running
+        elif event.key == pygame.K_RIGHT:
+            cls.running = False
+            cls.seek(cls.position + 1)
+        elif event.key == pygame.K_LEFT:
+            cls.running = False
+            cls.seek(cls.position - 1)
+        elif event.key == pygame.K_UP:
+            cls.seek_start(True)
+        elif event.key == pygame.K_DOWN:
+            cls.seek_start(False)
+        elif event.key == pygame.K_PAGEUP:
+            cls.seek_start(True, MatchRecorder.MATCH_START)
+        elif event.key == pygame.K_PAGEDOWN:
+            cls.seek_start(False, MatchRecorder.MATCH_START)
+        elif event.key == pygame.K_HOME:
+            cls.seek(0)
+        elif event.key == pygame.K_END:
+            cls.seek(len(cls.records) - 1)
+        elif event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+            cls.speed = min(cls.speed * 2, 64)
+        elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+            cls.speed = max(cls.speed // 2, 1)
+
+    @classmethod
+    def key_released(cls, event):
+        """Paddles are replayed, not controlled."""
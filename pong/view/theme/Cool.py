@@ -13,15 +13,19 @@ from pong.view.Assets import Assets
 
 class Cool(Assets):
     # ------------ Handling Images ------------------------
-    background = Assets.get_image("coolBg.png")
+    background_file = "coolBg.png"
+    background = None  # Loaded on first use, not on import
     
     def __init__(self) -> None:
         super().__init__()
         Assets.bind(Ball, "coolBall.png")
         Assets.bind(Paddle, "coolbluepaddle.png")
+        self.preload_sounds()
 
     @classmethod
     def get_background(cls):
+        if cls.background is None:
+            cls.background = cls.get_image(cls.background_file)
         return cls.background
 
     # -------------- Audio handling -----------------------------
@@ -14,15 +14,19 @@ from pong.view.Assets import Assets
 class Duckie(Assets):
     # ------------ Handling Images ------------------------
 
-    background = Assets.get_image("duckieBg.jpg")
+    background_file = "duckieBg.jpg"
+    background = None  # Loaded on first use, not on import
 
     def __init__(self) -> None:
         super().__init__()
         Assets.bind(Ball, "duckieBall.png")
         Assets.bind(Paddle, "coolbluepaddle.png")
+        self.preload_sounds()
 
     @classmethod
     def get_background(cls):
+        if cls.background is None:
+            cls.background = cls.get_image(cls.background_file)
         return cls.background
 
     # -------------- Audio handling -----------------------------
@@ -0,0 +1,35 @@
+# package pong.view.theme
+
+from pong.model.Ball import Ball
+from pong.model.Paddle import Paddle
+from pong.view.Assets import Assets
+
+"""
+   Specific theme
+   Sprites are regions of the sprites.png atlas
+"""
+
+
+class Neon(Assets):
+    # ------------ Handling Images ------------------------
+    background_file = "coolBg.png"
+    background = None  # Loaded on first use, not on import
+
+    atlas_file = "sprites.png"
+    atlas_regions = {
+        Ball: (110, 10, 31, 31),
+        Paddle: (69, 20, 12, 110),
+    }
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.bind_atlas()
+        self.preload_sounds()
+
+    @classmethod
+    def get_background(cls):
+        if cls.background is None:
+            cls.background = cls.get_image(cls.background_file)
+        return cls.background
+
+    # -------------- Audio handling -----------------------------
@@ -1,11 +1,155 @@
-from pong.view.PongGUI import PongGUI
-from pong.AI.PongAI import PongAI
+import argparse
+import os
+import sys
+
+"""
+   Entry point, e.g.
+     python run.py play
+     python run.py train --batched
+     python run.py train --workers 4 --decision-interval 4
+     python run.py train --headless --watch-every 100
+     python run.py train --workers --record matches.pongrec
+     python run.py replay matches.pongrec
+     python run.py play --record human.pongrec
+     python run.py play --theme neon
+     python run.py dataset data --champion-frames 1000000 --recordings human.pongrec
+     python run.py test
+     python run.py play --profile-overlay --profile-dump profile.jsonl
+     python run.py bench --output bench.json
+
+   Modules are imported by the command that needs them, so headless training
+   never imports pygame and playing never imports neat.
+"""
+
+
+def parse_args(args=None):
+    parser = argparse.ArgumentParser(description="Pong with a NEAT trained AI")
+    profiling = argparse.ArgumentParser(add_help=False)
+    profiling.add_argument("--profile", action="store_true", help="Time the phases of every frame")
+    profiling.add_argument("--profile-overlay", action="store_true", help="Show the frame timings on screen")
+    profiling.add_argument("--profile-dump", metavar="PATH", help="Append the frame timings to this JSONL file")
+    display = argparse.ArgumentParser(add_help=False)
+    display.add_argument("--theme", choices=("cool", "duckie", "neon"), default="cool", help="Look of the game")
+
+    commands = parser.add_subparsers(dest="command")
+    play = commands.add_parser("play", parents=[profiling, display], help="Play the game")
+    play.add_argument("--record", metavar="PATH", help="Record the games to this file")
+    commands.add_parser("test", parents=[profiling, display], help="Play against the trained AI (default)")
+
+    train = commands.add_parser("train", parents=[profiling, display], help="Train the AI")
+    train.add_argument("--checkpoint", help="Continue from this checkpoint, e.g. neat-checkpoint-54")
+    train.add_argument("--headless", action="store_true", help="Train without a window")
+    train.add_argument("--watch-every", type=int, default=0, help="When headless, render every Nth match")
+    train.add_argument("--workers", type=int, nargs="?", const=os.cpu_count(),
+                       help="Play matches headless in this many processes (all cores if no number given)")
+    train.add_argument("--batched", action="store_true", help="Step all matches of a generation together")
+    train.add_argument("--decision-interval", type=int, default=1, help="Frames between network decisions")
+    train.add_argument("--timestep", type=float, default=1, help="Frames simulated per update (with --workers)")
+    train.add_argument("--timings", metavar="PATH", help="Write per generation timings to this .csv or .jsonl file")
+    train.add_argument("--record", metavar="PATH", help="Record every match to this file (not with --batched)")
+
+    replay = commands.add_parser("replay", parents=[display], help="Replay a match recording")
+    replay.add_argument("path", help="Recording written by train --record")
+    replay.add_argument("--start", type=int, default=0, help="Record to start at")
+    replay.add_argument("--match", type=int, help="Start at the match with this id (its seed with --workers)")
+
+    commands.add_parser("export", help="Compile the saved best AI to best_ai_policy.npz")
+
+    dataset = commands.add_parser("dataset", help="Export (observation, action, outcome) samples to shards")
+    dataset.add_argument("directory", help="Write the shards to this directory (adding to those there)")
+    dataset.add_argument("--champion-frames", type=int, default=0, help="Frames of the best AI playing itself")
+    dataset.add_argument("--matches", type=int, default=256, help="Matches the best AI plays at once")
+    dataset.add_argument("--recordings", nargs="+", default=[], metavar="PATH", help="Recorded matches to add")
+    dataset.add_argument("--velocities", action="store_true", help="Add the paddle and ball speeds to the observations")
+    dataset.add_argument("--shard-mb", type=float, default=64, help="Maximum shard size")
+    dataset.add_argument("--seed", type=int, default=0)
+
+    bench = commands.add_parser("bench", help="Run the benchmarks")
+    bench.add_argument("names", nargs="*", help="Benchmarks to run (all by default)")
+    bench.add_argument("--quick", action="store_true", help="One run per benchmark instead of the best of three")
+    bench.add_argument("--output", metavar="PATH", help="Write the results as JSON to this file")
+    bench.add_argument("--baseline", metavar="PATH", help="Compare against this baseline (default: the stored one)")
+    bench.add_argument("--save-baseline", action="store_true", help="Store the results as the new baseline")
+    bench.add_argument("--tolerance", type=float, default=0.10, help="Relative change counted as a regression")
+    return parser.parse_args(args)
+
+
+def main(args=None):
+    args = parse_args(args)
+    if getattr(args, "record", None) and getattr(args, "batched", False):
+        sys.exit("--record does not work with --batched")
+    if getattr(args, "profile", False) or getattr(args, "profile_overlay", False) or getattr(args, "profile_dump", None):
+        from pong.perf.Profiler import Profiler
+        Profiler.enable(overlay=args.profile_overlay, dump_path=args.profile_dump)
+
+    if args.command == "play":
+        from pong.view.PongGUI import PongGUI
+        use_theme(args)
+        if args.record:
+            from pong.model.MatchRecorder import MatchRecorder
+            PongGUI.recorder = MatchRecorder(args.record)
+        try:
+            PongGUI.run()
+        finally:
+            if PongGUI.recorder is not None:
+                PongGUI.recorder.close()
+    elif args.command == "train":
+        if args.batched or args.workers is not None:
+            # Headless evaluators, no pygame needed
+            from pong.AI.Trainer import Trainer
+            Trainer.run_neat(args.checkpoint, workers=args.workers, batched=args.batched,
+                             decision_interval=args.decision_interval, timestep=args.timestep,
+                             timings=args.timings, record=args.record)
+        else:
+            from pong.AI.PongAI import PongAI
+            use_theme(args)
+            PongAI.run_neat(args.checkpoint, headless=args.headless, watch_every=args.watch_every,
+                            decision_interval=args.decision_interval, timestep=args.timestep,
+                            timings=args.timings, record=args.record)
+    elif args.command == "replay":
+        from pong.view.ReplayViewer import ReplayViewer
+        use_theme(args)
+        ReplayViewer.run(args.path, start=args.start, match=args.match)
+    elif args.command == "export":
+        from pong.AI.Trainer import Trainer
+        Trainer.export_policy()
+    elif args.command == "dataset":
+        import itertools
+        from pong.env.TrajectoryDataset import TrajectoryDataset
+        sources = []
+        if args.champion_frames:
+            sources.append(TrajectoryDataset.champion(args.champion_frames, matches=args.matches,
+                                                      seed=args.seed, velocities=args.velocities))
+        if args.recordings:
+            sources.append(TrajectoryDataset.recordings(args.recordings, velocities=args.velocities))
+        samples = TrajectoryDataset.export(itertools.chain(*sources), args.directory,
+                                           shard_bytes=int(args.shard_mb * 2**20))
+        print(f"Exported {samples} samples to {args.directory}")
+    elif args.command == "bench":
+        from pong.perf.Benchmark import Benchmark
+        Benchmark.TOLERANCE = args.tolerance
+        report = Benchmark.run(args.names, quick=args.quick)
+        if args.output:
+            Benchmark.save(report, args.output)
+        baseline = args.baseline or Benchmark.BASELINE
+        if args.save_baseline:
+            Benchmark.save(report, Benchmark.BASELINE)
+        elif os.path.exists(baseline):
+            if Benchmark.compare(report, Benchmark.load(baseline)):
+                sys.exit(1)
+        else:
+            print(f"No baseline at {baseline}, store one for this machine with --save-baseline")
+    else:
+        from pong.AI.PongAI import PongAI
+        use_theme(args)
+        PongAI.test_ai()
+
+
+def use_theme(args):
+    """Makes the GUI use the theme picked with --theme (the default one when run without a command)."""
+    from pong.view.PongGUI import PongGUI
+    PongGUI.theme = PongGUI.THEMES[getattr(args, "theme", "cool")]
+
+
 if __name__ == "__main__":
-    # Run the game normally
-    #PongGUI.run()
-    
-    # Train the AI
-    #PongAI.run_neat( load_checkpoint = "neat-checkpoint-54" )
-
-    # Test AI
-    PongAI.test_ai()
\ No newline at end of file
+    main()
@@ -0,0 +1,32 @@
+import os
+from pong.AI.AsyncCheckpointer import AsyncCheckpointer
+
+def run_generations(checkpointer: AsyncCheckpointer, generations: int):
+    for generation in range(generations):
+        checkpointer.start_generation(generation)
+        checkpointer.end_generation(None, {}, None)
+    checkpointer.close()
+
+def saved_generations(directory: str, prefix: str = "neat-checkpoint-"):
+    return sorted(int(name[len(prefix):]) for name in os.listdir(directory) if name.startswith(prefix))
+
+def test_keep_every_matches_save_schedule(tmp_path):
+    checkpointer = AsyncCheckpointer(str(tmp_path), interval=5, keep_last=3, keep_every=25)
+    run_generations(checkpointer, 100)
+    # Saved at 4, 9, 14, ...: the first after every 25 generations, and the last 3
+    assert saved_generations(str(tmp_path)) == [24, 49, 74, 89, 94, 99]
+
+def test_keep_every_not_multiple_of_interval(tmp_path):
+    checkpointer = AsyncCheckpointer(str(tmp_path), interval=5, keep_last=0, keep_every=7)
+    run_generations(checkpointer, 30)
+    # Saved at 4, 9, 14, 19, 24, 29: the first once 7, 14, 21 and 28 generations are done
+    assert saved_generations(str(tmp_path)) == [9, 14, 24, 29]
+
+def test_keep_every_with_deltas_keeps_bases(tmp_path):
+    checkpointer = AsyncCheckpointer(str(tmp_path), interval=5, full_every=4, keep_last=1, keep_every=25)
+    run_generations(checkpointer, 50)
+    # Full checkpoints are 4, 24 and 44: 49 is kept with its base
+    saved = saved_generations(str(tmp_path))
+    assert saved == [24, 44, 49]
+    for generation in saved:
+        AsyncCheckpointer.load(os.path.join(str(tmp_path), f"neat-checkpoint-{generation}"))
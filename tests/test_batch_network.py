@@ -0,0 +1,42 @@
+import random
+import neat
+import numpy as np
+import pytest
+from pong.AI.BatchNetwork import BatchNetwork
+from pong.AI.Trainer import Trainer
+
+def mutated_genomes(config, n: int, mutations: int, seed: int):
+    random.seed(seed)
+    genomes = []
+    for key in range(n):
+        genome = neat.DefaultGenome(key)
+        genome.configure_new(config.genome_config)
+        for _ in range(mutations):
+            genome.mutate(config.genome_config)
+        genomes.append(genome)
+    return genomes
+
+def test_decisions_match_feed_forward_network():
+    config = Trainer.load_config()
+    genomes = mutated_genomes(config, 64, 30, seed=1)
+    assert any(len(genome.nodes) > len(config.genome_config.output_keys) for genome in genomes)
+    batch = BatchNetwork.create(genomes, config)
+    nets = [neat.nn.FeedForwardNetwork.create(genome, config) for genome in genomes]
+    rng = np.random.default_rng(1)
+
+    for _ in range(50):
+        inputs = rng.uniform(-600, 600, (len(genomes), 3))
+        outputs = batch.activate(inputs)
+        decisions = batch.decide(inputs)
+        for i, net in enumerate(nets):
+            expected = net.activate(inputs[i].tolist())
+            np.testing.assert_allclose(outputs[i], expected, rtol=1e-9, atol=1e-9)
+            assert decisions[i] == expected.index(max(expected))
+
+@pytest.mark.parametrize("setting", [("activation", "sigmoid"), ("aggregation", "max")])
+def test_rejects_unsupported_nodes(setting):
+    config = Trainer.load_config()
+    genome = mutated_genomes(config, 1, 0, seed=2)[0]
+    setattr(genome.nodes[config.genome_config.output_keys[0]], *setting)
+    with pytest.raises(ValueError):
+        BatchNetwork.create([genome], config)
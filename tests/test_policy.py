@@ -0,0 +1,42 @@
+import os
+import pickle
+import neat
+import numpy as np
+import pytest
+from pong.AI.Policy import Policy
+from pong.AI.Trainer import Trainer
+from pong.model.Config import *
+
+@pytest.fixture(scope="module")
+def best_ai():
+    with open(os.path.join(Trainer.dir_path, "best_ai_object.pkl"), 'rb') as file:
+        genome = pickle.load(file)
+    config = Trainer.load_config()
+    return genome, neat.nn.FeedForwardNetwork.create(genome, config), config
+
+def states(n: int) -> np.ndarray:
+    """Random inputs in the ranges seen in play: paddle y, ball y, distance in x."""
+    rng = np.random.default_rng(0)
+    return np.column_stack([rng.uniform(0, GAME_HEIGHT - PADDLE_HEIGHT, n),
+                            rng.uniform(0, GAME_HEIGHT - BALL_HEIGHT, n),
+                            rng.uniform(0, GAME_WIDTH, n)])
+
+def check_decisions(policy: Policy, net):
+    inputs = states(2000)
+    batch = policy.decide_batch(inputs)
+    for i, row in enumerate(inputs.tolist()):
+        output = net.activate(row)
+        np.testing.assert_allclose(policy.activate(row), output, rtol=1e-9, atol=1e-9)
+        assert policy.decide(row) == batch[i] == output.index(max(output))
+
+def test_compiled_best_ai_decides_like_neat(best_ai):
+    genome, net, config = best_ai
+    check_decisions(Policy.from_genome(genome, config), net)
+
+def test_exported_best_ai_decides_like_neat(best_ai, tmp_path):
+    genome, net, config = best_ai
+    path = str(tmp_path / "policy.npz")
+    Policy.from_genome(genome, config).save(path)
+    check_decisions(Policy.load(path), net)
+    # The policy shipped next to the pickle is the same AI
+    check_decisions(Policy.load(os.path.join(Trainer.dir_path, "best_ai_policy.npz")), net)
@@ -0,0 +1,56 @@
+import random
+import numpy as np
+from pong.model.Config import PADDLE_SPEED
+from pong.model.PongBatch import PongBatch
+from pong.model.PongMatch import PongMatch
+
+class NoJitter(random.Random):
+    """Serves at random, bounces without the random spread (PongBatch with jitter=0)."""
+
+    def uniform(self, a, b):
+        return (a + b) / 2
+
+def state(match: PongMatch):
+    ball, left, right = match.ball, match.left_paddle, match.right_paddle
+    return ((ball.x, ball.y, ball.dx, ball.dy), (left.y, right.y),
+            (match.left_hits, match.right_hits), (match.points_left, match.points_right))
+
+def test_batch_matches_scalar_physics():
+    n, frames = 16, 5000
+    matches = [PongMatch(NoJitter(seed)) for seed in range(n)]
+    for match in matches:
+        match.load_entities()
+    batch = PongBatch(n, seed=0, jitter=0)
+    for i, match in enumerate(matches):
+        batch.ball_dx[i], batch.ball_dy[i] = match.ball.dx, match.ball.dy
+    rng = np.random.default_rng(0)
+    actions = np.zeros((n, 2), dtype=np.int64)
+    points = hits = 0
+
+    for frame in range(frames):
+        if frame % 8 == 0:
+            actions = rng.integers(0, 3, (n, 2))
+        for match, (left, right) in zip(matches, actions):
+            for paddle, action in ((match.left_paddle, left), (match.right_paddle, right)):
+                if action == PongBatch.UP:
+                    paddle.accelerate(0, -PADDLE_SPEED)
+                elif action == PongBatch.DOWN:
+                    paddle.accelerate(0, PADDLE_SPEED)
+            match.update()
+        scored = batch.step(actions)
+
+        for i in np.flatnonzero(scored):
+            # Serves are random on both sides: the batch takes the serve of the match
+            batch.ball_dx[i], batch.ball_dy[i] = matches[i].ball.dx, matches[i].ball.dy
+        points += int(np.count_nonzero(scored))
+        hits += int(batch.hits.sum())
+
+        balls, paddles, match_hits, match_points = (np.array(values) for values in zip(*map(state, matches)))
+        message = f"frame {frame}"
+        np.testing.assert_allclose(np.stack([batch.ball_x, batch.ball_y, batch.ball_dx, batch.ball_dy], axis=1),
+                                   balls, atol=1e-6, err_msg=message)
+        np.testing.assert_allclose(batch.paddle_y, paddles, atol=1e-6, err_msg=message)
+        np.testing.assert_array_equal(batch.hits, match_hits, err_msg=message)
+        np.testing.assert_array_equal(batch.points, match_points, err_msg=message)
+    # Paddles hit the ball, rallies ended and started again within the run
+    assert hits > 0 and points > 0
@@ -0,0 +1,40 @@
+import random
+from pong.model.Config import PADDLE_SPEED
+from pong.model.PongMatch import PongMatch
+
+def state(match: PongMatch):
+    ball, left, right = match.ball, match.left_paddle, match.right_paddle
+    return (ball.x, ball.y, ball.dx, ball.dy, left.y, left.dy, right.y, right.dy)
+
+def test_advance_matches_repeated_updates():
+    walls = hits = points = 0
+    for seed in range(20):
+        skipped = PongMatch(random.Random(seed))
+        stepped = PongMatch(random.Random(seed))
+        skipped.load_entities()
+        stepped.load_entities()
+        controller = random.Random(seed)
+
+        for _ in range(400):
+            speeds = (controller.choice((0, -PADDLE_SPEED, PADDLE_SPEED)),
+                      controller.choice((0, -PADDLE_SPEED, PADDLE_SPEED)))
+            for match in (skipped, stepped):
+                match.left_paddle.accelerate(0, speeds[0])
+                match.right_paddle.accelerate(0, speeds[1])
+
+            frames = skipped.advance(controller.choice((1, 4, 16, 64)))
+            for _ in range(frames):
+                dy = stepped.ball.dy
+                stepped.update()
+                walls += (dy > 0) != (stepped.ball.dy > 0)
+
+            assert (skipped.left_hits, skipped.right_hits, skipped.points_left, skipped.points_right) \
+                == (stepped.left_hits, stepped.right_hits, stepped.points_left, stepped.points_right)
+            assert skipped.last_hit == stepped.last_hit
+            for a, b in zip(state(skipped), state(stepped)):
+                assert abs(a - b) < 1e-6
+        hits += stepped.left_hits + stepped.right_hits
+        points += stepped.points_left + stepped.points_right
+
+    # The seeds cover every kind of event
+    assert walls > 0 and hits > 0 and points > 0
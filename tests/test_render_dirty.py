@@ -0,0 +1,35 @@
+import os
+import random
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+import pygame
+from pong.model.Config import GAME_WIDTH
+from pong.model.Pong import Pong
+from pong.model.PongMatch import PongMatch
+from pong.view.PongGUI import PongGUI
+from pong.view.theme.Cool import Cool
+
+def test_dirty_frames_equal_full_frames():
+    PongGUI.init_pygame()
+    PongGUI.assets = Cool()
+    PongGUI.dirty_rects = True
+    previous = Pong.match
+    match = PongMatch(random.Random(0))
+    match.load_entities()
+    Pong.use(match)
+    try:
+        PongGUI.render()
+        # The ball crosses the scoreboard and the hits text (no fill, at y 40) line by line
+        for y in range(0, 70, 6):
+            for x in range(GAME_WIDTH // 2 - 120, GAME_WIDTH // 2 + 120, 9):
+                match.ball.x, match.ball.y = x, y
+                match.left_hits = x // 100
+                PongGUI.render()
+                dirty = pygame.surfarray.array3d(PongGUI.screen)
+                PongGUI.drawn_rects = None
+                PongGUI.render()
+                assert (dirty == pygame.surfarray.array3d(PongGUI.screen)).all(), (x, y)
+    finally:
+        PongGUI.dirty_rects = False
+        Pong.use(previous)
+        pygame.quit()
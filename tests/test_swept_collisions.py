@@ -0,0 +1,56 @@
+import random
+import pytest
+from pong.model.Config import *
+from pong.model.Entity import Entity
+from pong.model.Paddle import Paddle
+from pong.model.PongMatch import PongMatch
+
+def play(match: PongMatch, updates: int, seed: int):
+    """Updates the match with random paddle moves, yields after every update."""
+    controller = random.Random(seed)
+    for _ in range(updates):
+        if controller.random() < 0.1:
+            match.left_paddle.accelerate(0, controller.choice((0, -PADDLE_SPEED, PADDLE_SPEED)))
+            match.right_paddle.accelerate(0, controller.choice((0, -PADDLE_SPEED, PADDLE_SPEED)))
+        match.update()
+        yield
+
+@pytest.mark.parametrize("timestep", [1, 2, 4, 8])
+def test_swept_entities_stay_in_bounds(timestep):
+    events = 0
+    for seed in range(5):
+        match = PongMatch(random.Random(seed), timestep=timestep, swept=True)
+        match.load_entities()
+        for _ in play(match, 4000 // timestep, seed):
+            for paddle in (match.left_paddle, match.right_paddle):
+                assert 0 <= paddle.y <= GAME_HEIGHT - PADDLE_HEIGHT
+            assert -1e-6 <= match.ball.y <= GAME_HEIGHT - BALL_HEIGHT + 1e-6
+            # A point is scored once the center of the ball leaves the field
+            assert -1e-6 <= match.ball.get_center_x() <= GAME_WIDTH + 1e-6
+        events += match.left_hits + match.right_hits + match.points_left + match.points_right
+    assert events > 0
+
+def unclamped_move(paddle: Paddle, dt: float = 1):
+    """Paddle.move before swept collisions: stops at the border, never clamped."""
+    if paddle.dy > 0:
+        if paddle.y >= GAME_HEIGHT - PADDLE_HEIGHT:
+            paddle.dy = 0
+    elif paddle.y <= 0:
+        paddle.dy = 0
+    Entity.move(paddle, dt)
+
+def test_unit_timestep_matches_unclamped_update(monkeypatch):
+    matches = []
+    for clamped in (True, False):
+        if not clamped:
+            monkeypatch.setattr(Paddle, "move", unclamped_move)
+        match = PongMatch(random.Random(7))
+        match.load_entities()
+        states = []
+        for _ in play(match, 20000, 7):
+            left, right, ball = match.entities
+            states.append((left.y, left.dy, right.y, right.dy, ball.x, ball.y, ball.dx, ball.dy,
+                           match.left_hits, match.right_hits, match.points_left, match.points_right))
+        matches.append(states)
+    assert matches[0] == matches[1]
+    assert any(state[0] in (0, GAME_HEIGHT - PADDLE_HEIGHT) for state in matches[0])
@@ -0,0 +1,58 @@
+import random
+from itertools import chain
+import numpy as np
+from pong.env.TrajectoryDataset import TrajectoryDataset
+from pong.model.Config import PADDLE_SPEED
+from pong.model.MatchRecorder import MatchRecorder
+from pong.model.PongMatch import PongMatch
+
+def record_matches(path: str, matches: int = 2, frames: int = 3000):
+    """Records matches of paddles moving at random."""
+    recorder = MatchRecorder(path)
+    moves = random.Random(1)
+    for match_id in range(matches):
+        match = PongMatch(random.Random(match_id))
+        match.load_entities()
+        recorder.begin_match(match, match_id)
+        for frame in range(frames):
+            if frame % 8 == 0:
+                match.left_paddle.accelerate(0, moves.choice([-PADDLE_SPEED, 0, PADDLE_SPEED]))
+                match.right_paddle.accelerate(0, moves.choice([-PADDLE_SPEED, 0, PADDLE_SPEED]))
+            match.update()
+            recorder.record(match)
+        recorder.end_match()
+    recorder.close()
+
+def episode_runs(directory: str):
+    """Returns the episode id of every run of contiguous samples, over all shards."""
+    episodes = np.concatenate([block["episodes"] for block in TrajectoryDataset.load(directory)])
+    return episodes[np.r_[True, episodes[1:] != episodes[:-1]]]
+
+def test_episodes_unique_across_sources_and_exports(tmp_path):
+    recording = str(tmp_path / "matches.rec")
+    record_matches(recording)
+    directory = str(tmp_path / "dataset")
+    sources = lambda: chain(TrajectoryDataset.champion(20000, matches=8), TrajectoryDataset.recordings([recording]))
+    TrajectoryDataset.export(sources(), directory, shard_bytes=2**16)
+    first = episode_runs(directory)
+    assert len(np.unique(first)) == len(first)
+
+    # Appending numbers on from the rallies already there
+    TrajectoryDataset.export(sources(), directory, shard_bytes=2**16)
+    runs = episode_runs(directory)
+    assert len(runs) == 2 * len(first)
+    assert len(np.unique(runs)) == len(runs)
+    assert runs[len(first):].min() > first.max()
+
+def test_episode_sides_share_rallies(tmp_path):
+    directory = str(tmp_path / "dataset")
+    TrajectoryDataset.export(TrajectoryDataset.champion(20000, matches=8), directory)
+    block = next(TrajectoryDataset.load(directory))
+    episodes, outcomes = block["episodes"], block["outcomes"]
+    starts = np.r_[True, episodes[1:] != episodes[:-1]]
+    # Both paddles of a rally: one won the point what the other lost
+    rallies = episodes[starts] // 2
+    assert np.all(np.bincount(rallies)[np.unique(rallies)] == 2)
+    by_rally = np.zeros(rallies.max() + 1, dtype=int)
+    np.add.at(by_rally, rallies, outcomes[starts])
+    assert np.all(by_rally == 0)